@@ -1,18 +1,62 @@
 # Ayaz Baig NEA Project
+import time
+
+# Start time of the program, used by the --startup-times option
+startTime = time.perf_counter()
+
 import os
 
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 import sys
-import matplotlib
-import math
-import numpy as np
+import argparse
+import hashlib
+import importlib
+import json
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+importTime = time.perf_counter()
+
+
+# Module which is only imported the first time one of its attributes is used
+# NumPy and matplotlib are loaded this way so the menu window can be shown before they are imported
+class LazyModule:
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attr):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attr)
+
+
+np = LazyModule("numpy")
+physics = LazyModule("physics")
+circuit = LazyModule("circuit")
+measurements = LazyModule("measurements")
+
+plottingLock = threading.Lock()
+plottingModules = None
 
-matplotlib.use('Qt5Agg')
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Figure
+# Imports the matplotlib Qt backend the first time a graph is needed, also called from a background thread once the
+# menu has been drawn so the modules are usually loaded by the time the user asks for a graph
+def plotting():
+    global plottingModules
+    with plottingLock:
+        if plottingModules is None:
+            import matplotlib
+            matplotlib.use('Qt5Agg')
+            from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
+            from matplotlib.figure import Figure
+
+            plottingModules = SimpleNamespace(FigureCanvasQTAgg=FigureCanvasQTAgg,
+                                              NavigationToolbar=NavigationToolbar2QT, Figure=Figure)
+    return plottingModules
 
 
 def resource_path(relative_path):
@@ -21,6 +65,219 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 
+# Scaled and rotated versions of the images used by the scenes, as (image, size, rotation)
+# These are built ahead of time so that creating a scene never has to resample an image
+ASSET_VARIANTS = [
+    ("./img/ruler.png", None, 60),
+    # The background scaled to the scene rect of each practical's view
+    ("./img/background2.png", (1100, 742), 0),
+    ("./img/background2.png", (1150, 700), 0),
+    ("./img/background2.png", (900, 800), 0),
+    ("./img/background2.png", (950, 850), 0),
+]
+
+
+# On-disk store of the pre-built image variants, one PNG per variant and device pixel ratio
+# Each PNG has a small JSON file next to it recording the modification time and hash of the source image,
+# a variant is rebuilt when the source image has changed since it was built
+# Only QImage is used here, so variants can be built on a background thread
+class AssetStore:
+    def __init__(self, cacheDir=None):
+        if cacheDir is None:
+            cacheDir = os.path.join(QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation),
+                                    "VirtualLab", "img")
+        self.cacheDir = cacheDir
+
+    def variantName(self, path, size, rotation, dpr):
+        key = "{}|{}|{}|{}".format(os.path.basename(path), size, rotation, dpr)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def sourceHash(path):
+        with open(path, "rb") as file:
+            return hashlib.sha1(file.read()).hexdigest()
+
+    # Returns the stored variant if it was built from the current version of the source image, otherwise None
+    def load(self, path, size=None, rotation=0, dpr=1.0):
+        name = self.variantName(path, size, rotation, dpr)
+        imagePath = os.path.join(self.cacheDir, name + ".png")
+        infoPath = os.path.join(self.cacheDir, name + ".json")
+        try:
+            with open(infoPath) as file:
+                info = json.load(file)
+            mtime = os.stat(path).st_mtime_ns
+        except (OSError, ValueError):
+            return None
+
+        if info.get("mtime") != mtime:
+            # The source has been touched, only rebuild if its contents have actually changed
+            if info.get("sha1") != self.sourceHash(path):
+                return None
+            info["mtime"] = mtime
+            self.writeInfo(infoPath, info)
+
+        image = QImage(imagePath)
+        if image.isNull():
+            return None
+        image.setDevicePixelRatio(dpr)
+        return image
+
+    # Resamples the source image into the variant, returns a null image if the source can't be read
+    def resample(self, path, size=None, rotation=0, dpr=1.0):
+        image = QImage(path)
+        if image.isNull():
+            return image
+
+        if rotation != 0:
+            image = image.transformed(QTransform().rotate(rotation), Qt.SmoothTransformation)
+        if size is not None:
+            target = QSize(round(size[0] * dpr), round(size[1] * dpr))
+        else:
+            target = QSize(round(image.width() * dpr), round(image.height() * dpr))
+        if target != image.size():
+            image = image.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        return image
+
+    # Saves a variant to the store, returns whether it was saved
+    # Like writeInfo, the PNG is written to a temporary file first, so a variant being built on the background thread
+    # is never read half written by the GUI thread
+    def save(self, image, path, size=None, rotation=0, dpr=1.0):
+        name = self.variantName(path, size, rotation, dpr)
+        imagePath = os.path.join(self.cacheDir, name + ".png")
+        tempPath = imagePath + ".tmp{}".format(threading.get_ident())
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            if image.save(tempPath, "PNG"):
+                os.replace(tempPath, imagePath)
+                info = {"source": path, "mtime": os.stat(path).st_mtime_ns, "sha1": self.sourceHash(path)}
+                self.writeInfo(os.path.join(self.cacheDir, name + ".json"), info)
+                return True
+        except OSError:
+            pass
+        # A failed save may have left part of the temporary file behind
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        return False
+
+    # Resamples the source image into the variant and saves it to the store
+    def build(self, path, size=None, rotation=0, dpr=1.0):
+        image = self.resample(path, size, rotation, dpr)
+        if not image.isNull():
+            self.save(image, path, size, rotation, dpr)
+            image.setDevicePixelRatio(dpr)
+        return image
+
+    def image(self, path, size=None, rotation=0, dpr=1.0):
+        image = self.load(path, size, rotation, dpr)
+        if image is None:
+            image = self.build(path, size, rotation, dpr)
+        return image
+
+    # Builds every variant listed in ASSET_VARIANTS which is missing or out of date, returns the number built
+    # A variant only counts as built once it has been saved to the store
+    def buildAll(self, dprs=(1.0,)):
+        built = 0
+        for relativePath, size, rotation in ASSET_VARIANTS:
+            path = resource_path(relativePath)
+            for dpr in dprs:
+                if self.load(path, size, rotation, dpr) is None:
+                    image = self.resample(path, size, rotation, dpr)
+                    if not image.isNull() and self.save(image, path, size, rotation, dpr):
+                        built += 1
+        return built
+
+    @staticmethod
+    def writeInfo(infoPath, info):
+        # Written to a temporary file first so a half written file is never read by another thread
+        tempPath = infoPath + ".tmp{}".format(threading.get_ident())
+        with open(tempPath, "w") as file:
+            json.dump(info, file)
+        os.replace(tempPath, infoPath)
+
+
+assetStore = AssetStore()
+
+
+# Device pixel ratio of the screen the application is running on, used to pick the variant with the right resolution
+def devicePixelRatio():
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app is not None else 1.0
+
+
+# Process-wide cache of decoded images, so each image file is only read from disk and decoded once
+# Entries are keyed by the path plus the target size and rotation, and the least recently used entries are evicted
+# once the decoded pixel data goes over the byte limit
+class PixmapCache:
+    def __init__(self, assetStore, maxBytes=64 * 1024 * 1024):
+        self.assetStore = assetStore
+        self.maxBytes = maxBytes
+        self.pixmaps = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # QPixmap is implicitly shared, so the copy handed out shares the cached pixel data until it is modified
+    def pixmap(self, path, size=None, rotation=0):
+        if size is not None:
+            size = (size.width(), size.height()) if isinstance(size, QSize) else tuple(size)
+        key = (path, size, rotation, devicePixelRatio())
+
+        pix = self.pixmaps.get(key)
+        if pix is not None:
+            self.hits += 1
+            self.pixmaps.move_to_end(key)
+            return QPixmap(pix)
+
+        self.misses += 1
+        if size is None and rotation == 0:
+            pix = QPixmap(path)
+        else:
+            # Scaled and rotated variants come from the asset store, which only resamples if the variant was not built
+            pix = QPixmap.fromImage(self.assetStore.image(path, size, rotation, devicePixelRatio()))
+
+        self.pixmaps[key] = pix
+        self.bytes += self.pixmapBytes(pix)
+        self.evict(key)
+        return QPixmap(pix)
+
+    # Removes the least recently used entries until the cache is back under its byte limit
+    def evict(self, keep=None):
+        for key in list(self.pixmaps.keys()):
+            if self.bytes <= self.maxBytes:
+                break
+            if key == keep:
+                continue
+            self.bytes -= self.pixmapBytes(self.pixmaps.pop(key))
+            self.evictions += 1
+
+    def setMaxBytes(self, maxBytes):
+        self.maxBytes = maxBytes
+        self.evict()
+
+    def clear(self):
+        self.pixmaps.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {"entries": len(self.pixmaps), "bytes": self.bytes, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+    @staticmethod
+    def pixmapBytes(pix):
+        return pix.width() * pix.height() * pix.depth() // 8
+
+
+pixmapCache = PixmapCache(assetStore)
+
+
+# Returns the decoded image at the given path from the shared cache, optionally scaled and rotated
+def loadPixmap(path, size=None, rotation=0):
+    return pixmapCache.pixmap(path, size, rotation)
+
+
 # parent window class, defines the basic attributes for each window
 class Window(QMainWindow):
     def __init__(self, *args, **kwargs):
@@ -34,10 +291,54 @@ class Window(QMainWindow):
         self.centralWidget = QWidget()
         self.setCentralWidget(self.centralWidget)
 
+        # Animation scenes made by the window, one for each scene class and choice
+        self.scenes = {}
+
     def _initUI(self):
         self.setWindowTitle("Virtual Lab")
         self.setGeometry(self._x, self._y, self._width, self._height)
 
+    # Returns the window to the state it was in when it was first created, so the same window can be shown again
+    def reset(self):
+        pass
+
+    # Scene for a practical, which is made the first time the practical is started and reset each time after that
+    # The window is the parent of its scenes, so they are deleted with it
+    def sceneFor(self, sceneClass, button, choice):
+        scene = self.scenes.get((sceneClass, choice))
+        if scene is None:
+            scene = sceneClass(button, choice)
+            scene.setParent(self)
+            self.scenes[(sceneClass, choice)] = scene
+        else:
+            scene.reset()
+        return scene
+
+
+# Keeps a single instance of each window, which is hidden and reset rather than rebuilt when the user moves between them
+# The windows are kept for as long as the application runs, so each one is only ever built once
+class Navigator:
+    def __init__(self):
+        self.windows = {}
+        self.current = None
+
+    def open(self, windowClass, *args):
+        window = self.windows.get(windowClass)
+        if window is None:
+            window = windowClass(*args)
+            self.windows[windowClass] = window
+        else:
+            window.reset(*args)
+
+        if self.current is not None and self.current is not window:
+            self.current.hide()
+        self.current = window
+        window.show()
+        return window
+
+
+navigator = Navigator()
+
 
 # Main menu window, which is a subclass of the parent window class
 # Includes two buttons which when pressed opens the relevant window
@@ -55,7 +356,7 @@ class MenuWindow(Window):
         self.layout.setSpacing(30)
 
         self.label = QLabel(self)
-        pix = QPixmap(resource_path("./img/logo2.png"))
+        pix = loadPixmap(resource_path("./img/logo2.png"))
         self.label.setPixmap(pix)
 
         # Each button given a PAG type attribute so when pressed the attribute is sent to the animation window
@@ -72,22 +373,19 @@ class MenuWindow(Window):
         self.layout.setAlignment(Qt.AlignHCenter | Qt.AlignVCenter)
 
         self.centralWidget.setLayout(self.layout)
-        self.show()
 
     # Function which creates the button, takes the PAG type and the button image as parameters
     def __initMenuButton(self, iconPath, pagType):
         button = QPushButton()
         button.clicked.connect(lambda: self.__windowClick(pagType))
         button.setIconSize(QSize(200, 150))
-        button.setIcon(QIcon(iconPath))
+        button.setIcon(QIcon(loadPixmap(iconPath)))
         button.setFlat(True)
 
         return button
 
     def __windowClick(self, pagType):
-        self.window = ChoiceWindow(pagType)
-        self.close()
-        self.window.show()
+        navigator.open(ChoiceWindow, pagType)
 
 
 # Choice window displays window which gives the user an option to show a sample animation or to let them do the practical themselves
@@ -106,7 +404,7 @@ class ChoiceWindow(Window):
         self.layout.setSpacing(30)
 
         self.label = QLabel(self)
-        pix = QPixmap(resource_path("./img/logo2.png"))
+        pix = loadPixmap(resource_path("./img/logo2.png"))
         self.label.setPixmap(pix)
 
         self.__choice1 = self.__initChoiceButton(resource_path("./img/manualChoice1.png"), 1, self.__pagType)
@@ -119,24 +417,23 @@ class ChoiceWindow(Window):
 
         self.centralWidget.setLayout(self.layout)
 
+    def reset(self, pagType):
+        self.__pagType = pagType
+
     def __initChoiceButton(self, iconPath, choice, pagType):
         button = QPushButton()
-        button.clicked.connect(lambda: self.windowClick(pagType, choice))
+        button.clicked.connect(lambda: self.windowClick(self.__pagType, choice))
         button.setIconSize(QSize(200, 150))
-        button.setIcon(QIcon(iconPath))
+        button.setIcon(QIcon(loadPixmap(iconPath)))
         button.setFlat(True)
 
         return button
 
     def windowClick(self, pagType, choice):
         if choice == 1:
-            self.window = AnimationWindow(pagType, choice)
-            self.close()
-            self.window.show()
+            navigator.open(AnimationWindow, pagType, choice)
         else:
-            self.window = DIYWindow(pagType, choice)
-            self.close()
-            self.window.show()
+            navigator.open(DIYWindow, pagType, choice)
 
 
 # Creates the animation view where the user can see all the graphics includes (e.g. the ball, animations of the ball etc.)
@@ -146,14 +443,29 @@ class AnimationView(QGraphicsView):
 
         self._initUI()
 
+    # The background is drawn into a cache which is only redrawn when the view or the scene changes, and only the
+    # area each moving item covers is painted again in a frame. The viewport is a plain QWidget, so everything is
+    # painted by Qt's software rasteriser and no OpenGL driver is needed
     def _initUI(self):
         self.scene = QGraphicsScene(self)
+        self.scene.sceneRectChanged.connect(lambda rect: self.resetCachedContent())
+
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
 
+    def setScene(self, scene):
+        super().setScene(scene)
+        self.resetCachedContent()
+
+    # The background comes from the pixmap cache already scaled to the scene rect, so it is copied rather than scaled
     def drawBackground(self, painter, rect):
         sceneRect = self.scene.sceneRect()
-        bg = QPixmap(resource_path("./img/background2.png"))
-        bgRect = QRectF(bg.rect())
-        painter.drawPixmap(sceneRect, bg, bgRect)
+        if sceneRect.isEmpty():
+            return
+        size = sceneRect.size().toSize()
+        bg = loadPixmap(resource_path("./img/background2.png"), (size.width(), size.height()))
+        painter.drawPixmap(sceneRect.topLeft(), bg)
 
 
 # Animation window where the animations are run
@@ -172,6 +484,8 @@ class AnimationWindow(Window):
 
         self.calcWindow = False
         self.animWindow = False
+        self.animView = None
+        self.calcBox = None
 
         # Main layout is a QHBoxLayout
         # Also includes several sub-layouts which are added to the main layout
@@ -215,9 +529,9 @@ class AnimationWindow(Window):
         calcButton = self.buttons("Calculate")
         calcButton.clicked.connect(lambda: self.calculations(self.pagType))
 
-        if self.pagType != "Planck":
-            self.changeButton = self.buttons("Change Type")
-            self.changeButton.clicked.connect(self.changeType)
+        self.changeButton = self.buttons("Change Type")
+        self.changeButton.clicked.connect(self.changeType)
+        self.changeButton.setVisible(self.pagType != "Planck")
 
         exitButton = self.buttons("Exit")
         exitButton.clicked.connect(self.exitToMenu)
@@ -225,9 +539,39 @@ class AnimationWindow(Window):
         self.layout.addLayout(self.buttonLayout)
         self.centralWidget.setLayout(self.layout)
 
+    def reset(self, pagType, choice):
+        self.stopScene()
+        self.removeCalcBox()
+
+        self.pagType = pagType
+        self.choice = choice
+        self.speed = 10
+        self.calcWindow = False
+        self.animWindow = False
+
+        self.changeButton.setVisible(self.pagType != "Planck")
+        self.startButton.setText("Start Example")
+        self.textBox.setFont(QFont("Arial", 20))
+        self.textBox.setText(None)
+
+    # Stops any running animation and releases the scene, used when the window is left or reset
+    def stopScene(self):
+        if self.animView is not None:
+            self.animView.stopAnims()
+            self.graphicsView.setScene(None)
+            self.animView = None
+        self.stack.setCurrentWidget(self.graphicsView)
+
+    # Removes the calculation box from the stacked widget so it is not kept alive after it has been replaced
+    def removeCalcBox(self):
+        if self.calcBox is not None:
+            self.stack.removeWidget(self.calcBox)
+            self.calcBox.deleteLater()
+            self.calcBox = None
+
     def __initArrow(self, iconPath):
         button = QPushButton()
-        button.setIcon(QIcon(iconPath))
+        button.setIcon(QIcon(loadPixmap(iconPath)))
         button.setFlat(True)
 
         return button
@@ -239,7 +583,7 @@ class AnimationWindow(Window):
         self.textBox.setFont(QFont("Arial", 20))
         if pagType == "Vertical":
             if self.startButton.text() == "Start Example":
-                self.animView = VerticalFall(self.startButton, choice)
+                self.animView = self.sceneFor(VerticalFall, self.startButton, choice)
                 self.graphicsView.scene.setSceneRect(-600, -20, 1100, 742)
                 self.graphicsView.setScene(self.animView)
                 self.stack.setCurrentWidget(self.graphicsView)
@@ -260,7 +604,7 @@ class AnimationWindow(Window):
                 self.startButton.setText("Pause Animation")
         elif pagType == "Ramp":
             if self.startButton.text() == "Start Example":
-                self.animView = RampFall(self.startButton, choice)
+                self.animView = self.sceneFor(RampFall, self.startButton, choice)
                 self.graphicsView.scene.setSceneRect(-400, -279, 1150, 700)
                 self.graphicsView.setScene(self.animView)
                 self.stack.setCurrentWidget(self.graphicsView)
@@ -281,7 +625,7 @@ class AnimationWindow(Window):
                 self.startButton.setText("Pause Animation")
         elif pagType == "Planck":
             if self.startButton.text() == "Start Example":
-                self.animView = PlanckAnim(self.startButton, choice)
+                self.animView = self.sceneFor(PlanckAnim, self.startButton, choice)
                 self.graphicsView.setScene(self.animView)
                 self.stack.setCurrentWidget(self.graphicsView)
                 self.animView.still(1, 700)
@@ -347,6 +691,7 @@ class AnimationWindow(Window):
             self.calcWindow = True
             self.animWindow = False
             self.startButton.setText("Start Example")
+            self.removeCalcBox()
             self.calcBox = CalculationVertical()
             self.stack.addWidget(self.calcBox)
             self.stack.setCurrentWidget(self.calcBox)
@@ -357,6 +702,7 @@ class AnimationWindow(Window):
             self.calcWindow = True
             self.animWindow = False
             self.startButton.setText("Start Example")
+            self.removeCalcBox()
             self.calcBox = CalculationRamp()
             self.stack.addWidget(self.calcBox)
             self.stack.setCurrentWidget(self.calcBox)
@@ -366,6 +712,7 @@ class AnimationWindow(Window):
             self.calcWindow = True
             self.animWindow = False
             self.startButton.setText("Start Example")
+            self.removeCalcBox()
             self.calcBox = CalculationPlanck()
             self.stack.addWidget(self.calcBox)
             self.stack.setCurrentWidget(self.calcBox)
@@ -379,12 +726,12 @@ class AnimationWindow(Window):
                 if self.animView.getAnimState() == 1:
                     self.textBox.setText("Drop Ball and Start Timer")
                     self.startButton.setText("Start Animation")
-                    self.animView.drop(250, 2, 320, "Distance = 0.5m")
+                    self.animView.drop(250, 2, 0.5, "Distance = 0.5m")
                 elif self.animView.getAnimState() == 2:
                     self.animView.still(3, 0, "Distance = 1m")
                     self.textBox.setText("Repeat at different heights")
                 elif self.animView.getAnimState() == 3:
-                    self.animView.drop(0, 4, 450, "Distance = 1m")
+                    self.animView.drop(0, 4, 1, "Distance = 1m")
                     self.startButton.setText("Start Animation")
                     self.textBox.setText("Drop Ball from second height and start Timer")
             elif not self.animWindow and self.calcWindow:
@@ -399,13 +746,13 @@ class AnimationWindow(Window):
             if not self.calcWindow and self.animWindow:
                 if self.animView.getAnimState() == 1:
                     self.textBox.setText("Roll Ball and Start Timer")
-                    self.animView.drop(200, 83, 2, 452, "Ramp Length = 0.5m, θ = 30°")
+                    self.animView.drop(200, 83, 2, 0.5, "Ramp Length = 0.5m, θ = 30°")
                 elif self.animView.getAnimState() == 2:
                     self.textBox.setText("Repeat at another length up the Ramp")
                     self.startButton.setText("Start Animation")
                     self.animView.still(3, 395, -30, "Ramp Length = 1m, θ = 30°")
                 elif self.animView.getAnimState() == 3:
-                    self.animView.drop(395, -30, 4, 640, "Ramp Length = 1m, θ = 30°")
+                    self.animView.drop(395, -30, 4, 1, "Ramp Length = 1m, θ = 30°")
                     self.textBox.setText("Roll Ball from second length and start Timer")
             elif not self.animWindow and self.calcWindow:
                 if not self.calcBox.getWorkingOut1Shown():
@@ -437,7 +784,7 @@ class AnimationWindow(Window):
                     self.startButton.setText("Start Animation")
                     self.textBox.setText("Measure the Distance of the Drop")
                 elif self.animView.getAnimState() == 3:
-                    self.animView.drop(250, 2, 320, "Distance = 0.5m")
+                    self.animView.drop(250, 2, 0.5, "Distance = 0.5m")
                     self.textBox.setText("Drop Ball and Start Timer")
                 elif self.animView.getAnimState() == 4:
                     self.animView.still(3, 0, "Distance = 1m")
@@ -459,7 +806,7 @@ class AnimationWindow(Window):
                     self.animView.still(1, 200, 83, "Ramp Length = 0.5m, θ = 30°")
                 elif self.animView.getAnimState() == 3:
                     self.textBox.setText("Roll Ball and Start Timer")
-                    self.animView.drop(200, 83, 2, 452, "Ramp Length = 0.5m, θ = 30°")
+                    self.animView.drop(200, 83, 2, 0.5, "Ramp Length = 0.5m, θ = 30°")
                 elif self.animView.getAnimState() == 4:
                     self.textBox.setText("Repeat at another length up the Ramp")
                     self.startButton.setText("Start Animation")
@@ -520,15 +867,13 @@ class AnimationWindow(Window):
             self.startButton.setText("Start Example")
             self.animWindow = False
             self.textBox.setText(None)
-            self.graphicsView.setScene(None)
-            self.stack.setCurrentWidget(self.graphicsView)
+            self.stopScene()
         elif button2.isChecked():
             self.pagType = button2.text()
             self.startButton.setText("Start Example")
             self.animWindow = False
             self.textBox.setText(None)
-            self.graphicsView.setScene(None)
-            self.stack.setCurrentWidget(self.graphicsView)
+            self.stopScene()
 
     def buttons(self, buttonText):
         button = QPushButton(buttonText)
@@ -539,9 +884,120 @@ class AnimationWindow(Window):
         return button
 
     def exitToMenu(self):
-        self.window = MenuWindow()
-        self.close()
-        self.window.show()
+        self.stopScene()
+        navigator.open(MenuWindow)
+
+
+# Table model which shows the measurements taken in a DIY practical, the data itself is kept in a MeasurementTable
+# Changes only tell the view about the cells which changed, rather than the whole table being filled in again
+# At least MIN_ROWS rows are shown, so the table looks the same before anything has been entered
+class MeasurementModel(QAbstractTableModel):
+    MIN_ROWS = 7
+    # Columns after the average, worked out from the running statistics of each row as the readings are entered
+    STATISTICS = ["Std dev", "Uncertainty (\u00b1)"]
+
+    # Headers are the names of the variable, of each reading and of the average
+    def __init__(self, headers):
+        super(MeasurementModel, self).__init__()
+        self.headers = headers
+        self.store = measurements.MeasurementTable()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return max(self.store.rows, self.MIN_ROWS)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.store.repeats + 2 + len(self.STATISTICS)
+
+    def averageColumn(self):
+        return self.store.repeats + 1
+
+    # The first column is the variable, followed by each repeat, the average and then the statistics
+    def cellValue(self, row, column):
+        if row >= self.store.rows:
+            return np.nan
+        if column == 0:
+            return self.store.values[row]
+        if column <= self.store.repeats:
+            return self.store.readings[row, column - 1]
+        if column == self.averageColumn():
+            return self.store.averages[row]
+        if column == self.averageColumn() + 1:
+            return round(self.store.standardDeviation(row), 3)
+        return round(self.store.uncertainty(row), 3)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        value = self.cellValue(index.row(), index.column())
+        return "" if np.isnan(value) else str(float(value))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return str(section + 1)
+        variable, reading, average = self.headers
+        if section == 0:
+            return variable
+        if section <= self.store.repeats:
+            return str(section) + ": " + reading
+        if section == self.averageColumn():
+            return average
+        statistic = section - self.averageColumn() - 1
+        return self.STATISTICS[statistic] if statistic < len(self.STATISTICS) else None
+
+    def setHeaders(self, headers):
+        self.headers = headers
+        self.headerDataChanged.emit(Qt.Horizontal, 0, self.columnCount() - 1)
+
+    def cellChanged(self, row, firstColumn, lastColumn=None):
+        self.dataChanged.emit(self.index(row, firstColumn), self.index(row, firstColumn if lastColumn is None
+                                                                       else lastColumn))
+
+    def addRow(self, value):
+        row = self.store.rows
+        if row < self.MIN_ROWS:
+            self.store.addRow(value)
+            self.cellChanged(row, 0)
+        else:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.store.addRow(value)
+            self.endInsertRows()
+        return row
+
+    # Adds a reading to the next repeat of the row, a column is added for another repeat if the row is already full
+    # Only the new reading and the statistics of its row change
+    def addReading(self, row, reading):
+        if self.store.isFull(row):
+            column = self.store.repeats + 1
+            self.beginInsertColumns(QModelIndex(), column, column)
+            repeat = self.store.addReading(row, reading)
+            self.endInsertColumns()
+        else:
+            repeat = self.store.addReading(row, reading)
+        self.cellChanged(row, repeat + 1)
+        self.cellChanged(row, self.averageColumn() + 1, self.columnCount() - 1)
+        return repeat
+
+    def calculateAverages(self):
+        self.store.calculateAverages()
+        if self.store.rows:
+            column = self.averageColumn()
+            self.dataChanged.emit(self.index(0, column), self.index(self.store.rows - 1, column))
+
+    def sort(self, column=0, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self.store.sort()
+        self.layoutChanged.emit()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
 
 
 # Creates a new window which has a different layout including some widgets to allow the user to have control over the practical
@@ -552,7 +1008,6 @@ class DIYWindow(Window):
         self.pagType = pagType
         self.choice = choice
         self.speed = 10
-        self.n = 0
         self._initUI()
 
     def _initUI(self):
@@ -561,6 +1016,9 @@ class DIYWindow(Window):
 
         self.animWindow = False
         self.calcWindow = False
+        self.animView = None
+        self.calcBox = None
+        self.graph = None
 
         self.mainLayout = QHBoxLayout()
         self.vLayout = QVBoxLayout()
@@ -572,9 +1030,9 @@ class DIYWindow(Window):
         self.startButton = self.buttons("Start Practical")
         self.editButton = self.buttons("Edit Animation")
         self.calcButton = self.buttons("Calculate")
-        if self.pagType != "Planck":
-            self.changeButton = self.buttons("Change Type")
-            self.changeButton.clicked.connect(self.changeType)
+        self.changeButton = self.buttons("Change Type")
+        self.changeButton.clicked.connect(self.changeType)
+        self.changeButton.setVisible(self.pagType != "Planck")
         self.exitButton = self.buttons("Exit")
 
         self.stack = QStackedWidget()
@@ -584,28 +1042,17 @@ class DIYWindow(Window):
 
         self.vLayout2.setAlignment(Qt.AlignVCenter)
 
-        # Table widget used to allow user to note down any measurements taken
-        self.table = QTableWidget()
-        self.table.setRowCount(7)
-        self.table.setColumnCount(5)
+        # Table used to allow user to note down any measurements taken
+        self.tableModel = MeasurementModel(self.tableHeaders())
+        self.table = QTableView()
+        self.table.setModel(self.tableModel)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        for i in range(7):
-            for j in range(5):
-                item = QTableWidgetItem("")
-                self.table.setItem(i, j, item)
         self.table.setFixedSize(425, 187)
-        self.tableEmpty = True
         self.vLayout2.addWidget(self.table, 1, 0)
 
-        if self.pagType != "Planck":
-            headers = ["Distance (m)", "1: time\u00b2 (s\u00b2)", "2: time\u00b2 (s\u00b2)", "3: time\u00b2 (s\u00b2)",
-                       "Average time\u00b2 (s\u00b2)"]
-        else:
-            headers = ["Wavelength (x 10^-9 m)", "1: Voltage (V)", "2: Voltage (V)", "3: Voltage (V)",
-                       "Average Voltage (V))"]
+        if self.pagType == "Planck":
             self.table.setFixedSize(498, 188)
 
-        self.table.setHorizontalHeaderLabels(headers)
         self.table.resizeColumnsToContents()
         self.table.resizeRowsToContents()
 
@@ -629,6 +1076,70 @@ class DIYWindow(Window):
 
         self.centralWidget.setLayout(self.mainLayout)
 
+    def reset(self, pagType, choice):
+        self.stopScene()
+        self.removeWidgets()
+
+        self.pagType = pagType
+        self.choice = choice
+        self.speed = 10
+        self.animWindow = False
+        self.calcWindow = False
+
+        self.changeButton.setVisible(self.pagType != "Planck")
+        if self.graph is not None:
+            self.graph.setType(self.pagType)
+        self.clearTable(True)
+        if self.pagType != "Planck":
+            self.table.setFixedSize(425, 187)
+        else:
+            self.table.setFixedSize(498, 188)
+
+        self.startButton.setText("Start Practical")
+        self.textBox.setFont(QFont("Arial", 20))
+        self.textBox.setText(None)
+
+    # Stops any running animation and releases the scene, used when the window is left or reset
+    def stopScene(self):
+        if self.animView is not None:
+            self.animView.stopAnims()
+            self.graphicsView.setScene(None)
+            self.animView = None
+        self.stack.setCurrentWidget(self.graphicsView)
+
+    # Page of the stacked widget with the graph of the table, made the first time it is needed and then kept, the graph
+    # follows the table from then on
+    def graphPage(self):
+        if self.calcBox is None:
+            self.graph = LiveGraph(self.tableModel, self.pagType)
+            self.calcText = QLineEdit()
+            self.calcText.setReadOnly(True)
+            self.calcText.setFont(QFont("Arial", 15))
+
+            self.calcBox = QGroupBox()
+            calcLayout = QVBoxLayout()
+            calcLayout.addWidget(self.graph)
+            calcLayout.addWidget(self.calcText)
+            self.calcBox.setLayout(calcLayout)
+            self.stack.addWidget(self.calcBox)
+        return self.calcBox
+
+    # Creates the button which switches between the scene and the graph while the practical is being done
+    def createGraphButton(self, row):
+        self.graphButton = QPushButton("Show Graph")
+        self.graphButton.clicked.connect(self.toggleGraph)
+        self.vLayout2.addWidget(self.graphButton, row, 0)
+
+    def toggleGraph(self):
+        if self.stack.currentWidget() is self.graphicsView:
+            self.graphPage()
+            self.calcText.setVisible(False)
+            self.stack.setCurrentWidget(self.calcBox)
+            self.graphButton.setText("Show Practical")
+        else:
+            self.stack.setCurrentWidget(self.graphicsView)
+            self.graphButton.setText("Show Graph")
+
     def buttons(self, buttonText):
         button = QPushButton(buttonText)
         button.setFixedSize(200, 130)
@@ -644,15 +1155,31 @@ class DIYWindow(Window):
                 self.errorLabel.setText("Tip: Measure Height from the bottom of the ball")
                 num = float(self.inputBox.text())
             else:
-                self.errorLabel = QLabel("Tip: Enter Wavelength in x 10^-9 nanometres (nm)")
+                self.errorLabel.setText("Tip: Enter Wavelength in x 10^-9 nanometres (nm)")
                 num = float(self.inputBox.text())
 
-            self.comboBox.addItem(str(num))
             self.inputBox.setText("")
-            item = QTableWidgetItem(str(num))
-            self.table.setItem(self.n, 0, item)
-            self.n += 1
-            self.tableEmpty = False
+            # Heights and wavelengths are lengths, a wavelength of 0 couldn't be plotted against 1/λ
+            if not 0 < num < float("inf"):
+                if self.pagType != "Planck":
+                    self.errorLabel.setText("Error: Enter height as a number of metres greater than 0")
+                else:
+                    self.errorLabel.setText("Error: Enter wavelength as a number of nanometres greater than 0")
+                return
+
+            # Each value has one row, which more readings are added to, so a value entered again is only chosen
+            if self.tableModel.store.findRow(num) is not None:
+                self.comboBox.setCurrentIndex(self.comboBox.findData(num))
+                if self.pagType != "Planck":
+                    self.errorLabel.setText("Tip: That height is already in the table, its readings go in the same row")
+                else:
+                    self.errorLabel.setText("Tip: That wavelength is already in the table, its readings go in the same "
+                                            "row")
+                return
+
+            # The value itself is kept with the item, so the reading goes to the right row however it was typed
+            self.comboBox.addItem(str(num), num)
+            self.tableModel.addRow(num)
         except:
             if self.pagType != "Planck":
                 self.errorLabel.setText("Error: Incorrect form entered, Enter height as a number in metres")
@@ -667,26 +1194,24 @@ class DIYWindow(Window):
                 time = float(self.inputBox2.text())
                 calc = round(time ** 2, 3)
             else:
-                calc = self.inputBox2.text()
+                calc = float(self.inputBox2.text())
 
             self.inputBox2.setText("")
-            if not self.tableEmpty:
-                for r in range(7):
-                    item = self.table.item(r, 0)
-                    if item.text() == self.comboBox.currentText():
-                        row = r
-
-                item = QTableWidgetItem(str(calc))
-
-                for i in range(4):
-                    test = self.table.item(row, i)
-                    if test.text() == "":
-                        self.table.setItem(row, i, item)
-            else:
+            # Nothing may be chosen in the list, or the value chosen may no longer be in the table once it is cleared
+            value = self.comboBox.currentData()
+            row = self.tableModel.store.findRow(value) if value is not None else None
+            if row is not None:
+                self.tableModel.addReading(row, calc)
+            elif self.tableModel.store.isEmpty():
                 if self.pagType != "Planck":
                     self.errorLabel2.setText("Tip: Enter some heights first")
                 else:
                     self.errorLabel2.setText("Tip: Enter some wavelengths first")
+            else:
+                if self.pagType != "Planck":
+                    self.errorLabel2.setText("Tip: Choose a height in the table from the list first")
+                else:
+                    self.errorLabel2.setText("Tip: Choose a wavelength in the table from the list first")
 
         except:
             if self.pagType != "Planck":
@@ -696,82 +1221,26 @@ class DIYWindow(Window):
 
     # Procedure calculates the average value of each row in the table and adds the average into the table
     def calcAverage(self):
-        for r in range(7):
-            total = 0
-            numList = []
-            for c in range(1, 4):
-                num = self.table.item(r, c)
-                if num.text() != "":
-                    numList.append(float(num.text()))
-
-            for item in numList:
-                total = total + item
-
-            try:
-                avg = round((total / len(numList)), 3)
-                avgItem = QTableWidgetItem(str(avg))
-                self.table.setItem(r, 4, avgItem)
-            except:
-                pass
-
-    # Function returns the data in the table as a dictionary
-    def tableAsDict(self):
-        rows = {}
-        rowCount = self.table.rowCount()
-        for r in range(rowCount):
-            rowItem = self.table.item(r, 0)
-            if rowItem.text() != "":
-                times = []
-                colCount = self.table.columnCount()
-                for i in range(1, (colCount)):
-                    item = self.table.item(r, i)
-                    times.append(item.text())
-
-                rows[float(rowItem.text())] = times
-
-        return rows
-
-    # Procedure sorts the table in ascending order based on the values in the first column
-    def sortTable(self):
-        if not self.tableEmpty:
-            data = self.tableAsDict()
-            heights = []
-            for key in data.keys():
-                heights.append(key)
+        self.tableModel.calculateAverages()
 
-            mergeSort(heights)
-            self.clearTable(True)
+    # Procedure sorts the table in ascending order based on the values in the first column, then the averages
+    def sortTable(self):
+        self.tableModel.sort()
 
-            rowCount = self.table.rowCount()
-            for r in range(len(heights)):
-                height = heights[r]
-                hItem = QTableWidgetItem(str(height))
-                self.table.setItem(r, 0, hItem)
-                for i, item in enumerate(data[height]):
-                    nItem = QTableWidgetItem(item)
-                    self.table.setItem(r, (i + 1), nItem)
+    # Names of the variable, of each reading and of the average shown in the table headers for the current practical
+    def tableHeaders(self):
+        if self.pagType != "Planck":
+            return ["Distance (m)", "time\u00b2 (s\u00b2)", "Average time\u00b2 (s\u00b2)"]
+        return ["Wavelength (x 10^-9 m)", "Voltage (V)", "Average Voltage (V))"]
 
     # Procedure clears all the data in the table and resets it back to default
     def clearTable(self, sorting):
-        self.table.clear()
         if not sorting:
             self.comboBox.clear()
-        self.n = 0
-        if self.pagType != "Planck":
-            headers = ["Distance (m)", "1: time\u00b2 (s\u00b2)", "2: time\u00b2 (s\u00b2)", "3: time\u00b2 (s\u00b2)",
-                       "Average time\u00b2 (s\u00b2)"]
-        else:
-            headers = ["Wavelength (x 10^-9 m)", "1: Voltage (V)", "2: Voltage (V)", "3: Voltage (V)",
-                       "Average Voltage (V))"]
-
-        self.table.setHorizontalHeaderLabels(headers)
-        for i in range(7):
-            for j in range(5):
-                item = QTableWidgetItem("")
-                self.table.setItem(i, j, item)
+        self.tableModel.clear()
+        self.tableModel.setHeaders(self.tableHeaders())
         self.table.resizeColumnsToContents()
         self.table.resizeRowsToContents()
-        self.tableEmpty = True
 
     # Creates a group box widget which includes the input boxes used during the practical stage
     def createGroupBox1(self):
@@ -841,8 +1310,9 @@ class DIYWindow(Window):
                 self.vLayout2.addWidget(self.avgButton, 3, 0)
                 self.vLayout2.addWidget(self.sortButton, 4, 0)
                 self.vLayout2.addWidget(self.clearButton, 5, 0)
+                self.createGraphButton(6)
 
-                self.animView = VerticalFall(self.startButton, choice)
+                self.animView = self.sceneFor(VerticalFall, self.startButton, choice)
                 self.graphicsView.scene.setSceneRect(-500, -100, 900, 800)
                 self.graphicsView.setScene(self.animView)
                 self.stack.setCurrentWidget(self.graphicsView)
@@ -886,8 +1356,9 @@ class DIYWindow(Window):
                 self.vLayout2.addWidget(self.avgButton, 3, 0)
                 self.vLayout2.addWidget(self.sortButton, 4, 0)
                 self.vLayout2.addWidget(self.clearButton, 5, 0)
+                self.createGraphButton(6)
 
-                self.animView = RampFall(self.startButton, choice)
+                self.animView = self.sceneFor(RampFall, self.startButton, choice)
                 self.graphicsView.scene.setSceneRect(-300, -150, 950, 850)
                 self.graphicsView.setScene(self.animView)
                 self.stack.setCurrentWidget(self.graphicsView)
@@ -917,8 +1388,18 @@ class DIYWindow(Window):
 
                     self.vLayout2.addWidget(self.groupBox, 0, 0)
 
-                self.removeWires = QPushButton("Remove Wires")
-                self.removeWires.clicked.connect(self.sceneRemoveWires)
+                removeWires = QPushButton("Remove Wires")
+                removeWires.clicked.connect(self.sceneRemoveWires)
+
+                undoWire = QPushButton("Undo Wire")
+                undoWire.clicked.connect(self.sceneUndoWire)
+
+                wireLayout = QHBoxLayout()
+                wireLayout.setContentsMargins(0, 0, 0, 0)
+                wireLayout.addWidget(removeWires)
+                wireLayout.addWidget(undoWire)
+                self.removeWires = QWidget()
+                self.removeWires.setLayout(wireLayout)
 
                 self.avgButton = QPushButton("Calculate Average")
                 self.avgButton.clicked.connect(self.calcAverage)
@@ -933,23 +1414,19 @@ class DIYWindow(Window):
                 self.vLayout2.addWidget(self.avgButton, 4, 0)
                 self.vLayout2.addWidget(self.sortButton, 5, 0)
                 self.vLayout2.addWidget(self.clearButton, 6, 0)
+                self.createGraphButton(7)
 
                 self.animWindow = True
                 self.calcWindow = False
 
-                self.animView = PlanckAnim(self.startButton, choice)
+                self.animView = self.sceneFor(PlanckAnim, self.startButton, choice)
                 self.graphicsView.setScene(self.animView)
                 self.stack.setCurrentWidget(self.graphicsView)
                 self.animView.DIYAnim()
                 self.startButton.setText("Start Animation")
                 self.textBox.setText("Connect the circuit")
             elif self.startButton.text() == "Start Animation":
-                self.circuitConnected = True
-                components = self.animView.getComponents()
-                for item in components:
-                    length = len(item)
-                    if item[length - 1] > item[length - 2]:
-                        self.circuitConnected = False
+                self.circuitConnected = self.animView.circuitComplete()
 
                 if self.circuitConnected:
                     self.animView.changeConnected(self.circuitConnected)
@@ -965,36 +1442,26 @@ class DIYWindow(Window):
         self.startButton.setText("Start Animation")
         self.textBox.setText("Connect the circuit")
 
+    # Removes the last wire drawn, wires can also be removed one at a time by right clicking on them
+    def sceneUndoWire(self):
+        self.animView.undoWire()
+        self.startButton.setText("Start Animation")
+        self.textBox.setText("Connect the circuit")
+
     # Creates and displays the relevant widgets used in the calculation stage, such as the graph
     def calculations(self, pagType):
         if not self.calcWindow and self.animWindow:
             self.startButton.setText("Start Practical")
             self.textBox.setText("Calculate Gradient from the graph to get a value for g")
 
-            if pagType != "Planck":
-                self.removeWidgets()
-            else:
-                self.vLayout2.removeWidget(self.groupBox)
-                self.groupBox.deleteLater()
-
-                self.vLayout2.removeWidget(self.removeWires)
-                self.removeWires.deleteLater()
-
-                self.vLayout2.removeWidget(self.avgButton)
-                self.avgButton.deleteLater()
-
-                self.vLayout2.removeWidget(self.sortButton)
-                self.sortButton.deleteLater()
-
-                self.vLayout2.removeWidget(self.clearButton)
-                self.clearButton.deleteLater()
+            self.removeWidgets()
 
             self.calcWindow = True
             self.animWindow = False
 
-            self.calcText = QLineEdit()
-            self.calcText.setReadOnly(True)
-            self.calcText.setFont(QFont("Arial", 15))
+            self.graphPage()
+            self.calcText.setText("")
+            self.calcText.setVisible(True)
 
             self.groupBox2 = QGroupBox()
             self.grpLayout2 = QVBoxLayout()
@@ -1029,70 +1496,14 @@ class DIYWindow(Window):
 
             self.vLayout2.addWidget(self.groupBox2, 0, 0)
 
-            self.sortTable()
             self.calcAverage()
-            tableData = self.tableAsDict()
-            self.graphView = self.DIYGraphView(tableData)
-
-            if self.graphView != 0:
-                calcBox = QGroupBox()
-                calcLayout = QVBoxLayout()
-                calcLayout.addWidget(self.graphView)
-                calcLayout.addWidget(self.calcText)
-                calcBox.setLayout(calcLayout)
-                self.stack.addWidget(calcBox)
-                self.stack.setCurrentWidget(calcBox)
-
-    # Creates a graph based on the data entered by the user in the table
-    def DIYGraphView(self, data):
-        try:
-            graph = MplCanvas(self, width=5, height=4, dpi=100)
-            x = []
-            y = []
-            for key in data.keys():
-                y.append(key)
-                a = data[key]
-                x.append(float(a[len(a) - 1]))
-
-            if self.pagType == "Planck":
-                for item in y:
-                    index = y.index(item)
-                    newItem = 1 / (float(item) * 10 ** -9)
-                    y[index] = newItem
+            self.sortTable()
 
-            if self.pagType != "Planck":
-                graph.axes.set_xlabel('time\u00b2 (s\u00b2)')
-                graph.axes.set_ylabel('Distance (m)')
-                graphX = np.array(x)
-                graphY = np.array(y)
+            if self.graph.rowPoints:
+                self.stack.setCurrentWidget(self.calcBox)
             else:
-                graph.axes.set_xlabel('1/λ × 10^6')
-                graph.axes.set_ylabel('Voltage (V)')
-                graphX = np.array(y)
-                graphY = np.array(x)
-
-            self.m, c = np.polyfit(graphX, graphY, 1)
-            graph.axes.plot(graphX, graphY, "x")
-            graph.axes.plot(graphX, self.m * graphX + c)
-
-            graph.axes.grid(b=True, which='major', color='#666666', linestyle='-')
-            graph.axes.minorticks_on()
-            graph.axes.grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
-
-            graphLayout = QVBoxLayout()
-
-            toolbar = NavigationToolbar(graph, self)
-
-            graphLayout.addWidget(toolbar)
-            graphLayout.addWidget(graph)
-
-            graphWidget = QWidget()
-            graphWidget.setLayout(graphLayout)
-
-            return graphWidget
-        except:
-            self.textBox.setText("Error: No Data has been input into the table")
-            return 0
+                self.stack.setCurrentWidget(self.graphicsView)
+                self.textBox.setText("Error: No Data has been input into the table")
 
     # Procedure run when a value for the gradient is entered into the relevant input box
     def gradientEntered(self):
@@ -1112,12 +1523,12 @@ class DIYWindow(Window):
         text2 = self.finalValueEnter.text()
         try:
             if self.pagType != "Planck":
-                error = abs(((9.81 - float(text2)) / 9.81) * 100)
+                error = physics.percentageError(physics.G, float(text2))
                 finalError = round(error, 1)
                 finalText = textSplit[0] + ", " + "Value for g: " + str(
                     text2) + "m/s\u00b2" + ", " + "Percentage Error: " + str(finalError) + "%"
             else:
-                error = abs(((6.63e-34 - float(text2)) / 6.63e-34) * 100)
+                error = physics.percentageError(physics.PLANCK, float(text2))
                 finalError = round(error, 1)
                 finalText = textSplit[0] + ", " + "Value for g: " + str(text2) + ", Percentage Error: " + str(
                     finalError) + "%"
@@ -1139,6 +1550,10 @@ class DIYWindow(Window):
             self.vLayout2.removeWidget(self.groupBox)
             self.groupBox.deleteLater()
 
+            if self.pagType == "Planck":
+                self.vLayout2.removeWidget(self.removeWires)
+                self.removeWires.deleteLater()
+
             self.vLayout2.removeWidget(self.avgButton)
             self.avgButton.deleteLater()
 
@@ -1147,6 +1562,9 @@ class DIYWindow(Window):
 
             self.vLayout2.removeWidget(self.clearButton)
             self.clearButton.deleteLater()
+
+            self.vLayout2.removeWidget(self.graphButton)
+            self.graphButton.deleteLater()
         elif self.calcWindow:
             self.vLayout2.removeWidget(self.groupBox2)
             self.groupBox2.deleteLater()
@@ -1187,9 +1605,8 @@ class DIYWindow(Window):
             self.removeWidgets()
             self.animWindow = False
             self.textBox.setText(None)
-            self.graphicsView.setScene(None)
+            self.stopScene()
             self.clearTable(True)
-            self.stack.setCurrentWidget(self.graphicsView)
 
         elif button2.isChecked():
             self.pagType = button2.text()
@@ -1197,9 +1614,8 @@ class DIYWindow(Window):
             self.removeWidgets()
             self.animWindow = False
             self.textBox.setText(None)
-            self.graphicsView.setScene(None)
+            self.stopScene()
             self.clearTable(True)
-            self.stack.setCurrentWidget(self.graphicsView)
 
     # Procedure displays a Dialog box which allows the user to change parts of the animation/practical
     def editAnimation(self):
@@ -1223,7 +1639,7 @@ class DIYWindow(Window):
             grpLayout.addWidget(speedSlider, 0, 1)
         else:
             choice = QComboBox()
-            wavelengths = ["700", "630", "580", "520", "450", "420", "380"]
+            wavelengths = [str(led) for led in sorted(physics.LedThresholdModel.LEDS, reverse=True)]
             choice.addItems(wavelengths)
             label = QLabel("Choose Wavelength of LED (nm):")
             grpLayout.addWidget(label, 0, 0)
@@ -1251,9 +1667,8 @@ class DIYWindow(Window):
             self.animView.changeLED(self.led)
 
     def exitToMenu(self):
-        self.window = MenuWindow()
-        self.close()
-        self.window.show()
+        self.stopScene()
+        navigator.open(MenuWindow)
 
 
 # Class definition for the graphics objects used in the animation
@@ -1262,8 +1677,10 @@ class GraphicsObject(QObject):
     def __init__(self, imgPath):
         super().__init__()
 
-        itemPixmap = QPixmap(imgPath)
+        itemPixmap = loadPixmap(imgPath)
         self.item = QGraphicsPixmapItem(itemPixmap)
+        # Items are only ever moved, never scaled or rotated, so the rendered item can be reused as it moves
+        self.item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
     def setPosition(self, position):
         self.item.setPos(position)
@@ -1271,55 +1688,291 @@ class GraphicsObject(QObject):
     position = pyqtProperty(QPointF, fset=setPosition)
 
 
+# Text drawn straight into a scene, used for the clock, the voltmeter reading and the labels of the example animations
+# in place of QLabel and QLineEdit widgets, which would each need a proxy widget rendering them offscreen
+# The box is a rect item with the fixed size set by setGeometry, like the widgets it replaces, and the text is a child
+# item centred in it. Only the text item changes when the text is changed, and it keeps its rendered glyphs in a cache
+# so it is only drawn again when its text changes
+class SceneText(QGraphicsRectItem):
+    def __init__(self, text="", pointSize=15, boxed=False):
+        super(SceneText, self).__init__()
+
+        # Boxed text looks like a read only QLineEdit, otherwise like a QLabel
+        palette = QApplication.palette()
+        if boxed:
+            self.setBrush(palette.base())
+            self.setPen(QPen(palette.mid().color()))
+        else:
+            self.setBrush(palette.window())
+            self.setPen(QPen(Qt.NoPen))
+
+        self.label = QGraphicsSimpleTextItem(self)
+        self.label.setFont(QFont("Arial", pointSize))
+        self.label.setBrush(palette.text())
+        self.label.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.setText(text)
+
+    def text(self):
+        return self.label.text()
+
+    def setText(self, text):
+        if text != self.label.text():
+            self.label.setText(text)
+            self.centreText()
+
+    def centreText(self):
+        textRect = self.label.boundingRect()
+        centre = self.rect().center()
+        self.label.setPos(centre.x() - textRect.width() / 2, centre.y() - textRect.height() / 2)
+
+    # Takes the same arguments as QWidget.setGeometry, either a QRect or x, y, width and height
+    def setGeometry(self, *geometry):
+        rect = QRectF(*geometry)
+        self.setPos(rect.topLeft())
+        self.setRect(0, 0, rect.width() - 1, rect.height() - 1)
+        self.centreText()
+
+
+# Distance in pixels from a component within which the end of a wire is connected to it
+SNAP_DISTANCE = 10
+
+
+# Component of the DIY circuit which wires can be connected to
+# Terminals are the points on the item which the ends of wires snap to, numbered in the same order as in the netlist
+class CircuitComponent:
+    def __init__(self, name, item, terminals):
+        self.name = name
+        self.item = item
+        self.terminals = terminals
+
+    # Number and position in scene coordinates of the terminal closest to the point
+    def nearestTerminal(self, point):
+        terminals = [(index, self.item.mapToScene(terminal)) for index, terminal in enumerate(self.terminals)]
+        return min(terminals, key=lambda terminal: QLineF(point, terminal[1]).length())
+
+
+# Interval in ms between updates of the clock and readouts in a scene, roughly once per frame
+FRAME_INTERVAL = 16
+
+
+# Stopwatch measured against a monotonic clock, so the time shown does not drift when timer ticks are late or missed
+# The measured time is divided by the animation speed, so it is always the real time of the practical
+class Stopwatch:
+    def __init__(self):
+        self.clock = QElapsedTimer()
+        self.speed = 1
+        self.stored = 0
+        self.running = False
+
+    def start(self, speed=1):
+        self.speed = speed
+        self.stored = 0
+        self.running = True
+        self.clock.start()
+
+    def pause(self):
+        if self.running:
+            self.stored += self.clock.elapsed()
+            self.running = False
+
+    def resume(self):
+        if not self.running:
+            self.running = True
+            self.clock.start()
+
+    # Stops the stopwatch, optionally setting the time to the exact length of the animation it was timing
+    def stop(self, animTime=None):
+        self.pause()
+        if animTime is not None:
+            self.stored = animTime
+
+    def reset(self):
+        self.stored = 0
+        self.running = False
+
+    # Time in ms the stopwatch has been running for, which is how far through the animation should be
+    def runTime(self):
+        animTime = self.stored
+        if self.running:
+            animTime += self.clock.elapsed()
+        return animTime
+
+    # Real time of the practical in ms
+    def elapsed(self):
+        return self.runTime() / self.speed
+
+
+# Animation of an object's position, which is moved on by the frame clock of its scene instead of having its own timer
+# Takes the same settings as a QPropertyAnimation, the target needs a setPosition method
+class FrameAnimation:
+    def __init__(self, target):
+        self.target = target
+        self.startValue = QPointF()
+        self.endValue = QPointF()
+        self.easing = QEasingCurve(QEasingCurve.Linear)
+        self.animDuration = 250
+        self.time = 0
+
+    def setStartValue(self, value):
+        self.startValue = QPointF(value)
+
+    def setEndValue(self, value):
+        self.endValue = QPointF(value)
+
+    # Takes a Qt easing curve, or any object with a valueForProgress method such as a physics Trajectory
+    def setEasingCurve(self, easing):
+        if isinstance(easing, (QEasingCurve, QEasingCurve.Type)):
+            easing = QEasingCurve(easing)
+        self.easing = easing
+
+    def setDuration(self, msecs):
+        self.animDuration = msecs
+
+    def duration(self):
+        return self.animDuration
+
+    def currentTime(self):
+        return self.time
+
+    # Moves the target to where it should be the given number of ms into the animation
+    def setCurrentTime(self, msecs):
+        self.time = min(max(int(msecs), 0), self.animDuration)
+        progress = self.time / self.animDuration if self.animDuration > 0 else 1.0
+        eased = self.easing.valueForProgress(progress)
+        self.target.setPosition(self.startValue + (self.endValue - self.startValue) * eased)
+
+    def isFinished(self):
+        return self.time >= self.animDuration
+
+
 # Parent graphics scene class, which sets the default attributes and methods of the animation view
+# Each scene has a single frame clock: one timer which moves every playing animation on to the stopwatch's time and
+# then updates the clock and readouts, so everything changed in a frame is redrawn in one scene update
+# The objects and animations of a scene are made once, going between the steps of a practical only moves and changes
+# them, so a scene holds the same number of items however many times the steps are gone through
 class AnimScene(QGraphicsScene):
+    # Emitted when the animations being played have finished
+    finished = pyqtSignal()
+
     def __init__(self, button, choice):
         super(AnimScene, self).__init__()
 
-        self.seconds = 0
-        self.milli = 0
+        self.stopwatch = Stopwatch()
+        self.clockAnim = None
+        self.playing = []
         self.animState = 1
         self.speed = 1
         self.button = button
         self.animations = []
         self.choice = choice
+        self.built = False
 
         self.initView()
 
     def initView(self):
         self.timer = QTimer()
-        self.timer.timeout.connect(self.updateTimer)
+        self.timer.timeout.connect(self.advanceFrame)
 
-        self.clock = QLabel()
-        self.clock.setFont(QFont("Arial", 15))
-        self.clock.setAlignment(Qt.AlignCenter)
-        self.clock.setText("00:00")
+        self.clock = SceneText("00:00")
 
-        self.addWidget(self.clock)
+        self.addItem(self.clock)
+
+    # Boxed text used to label the scene, added to the scene by createScene
+    def createLabel(self, text, geometry):
+        label = SceneText(text, 10, boxed=True)
+        label.setGeometry(geometry)
+        return label
+
+    # Adds the objects to the scene the first time it is shown
+    def buildScene(self):
+        if not self.built:
+            self.createScene()
+            self.built = True
+
+    # Numbers of scene items, widgets embedded in the scene, animations and signal connections, so a test can check
+    # that none of them grow as the steps of a practical are gone through
+    def debugCounts(self):
+        items = self.items()
+        return {"items": len(items),
+                "proxies": sum(isinstance(item, QGraphicsProxyWidget) for item in items),
+                "animations": len(self.animations),
+                "connections": self.timer.receivers(self.timer.timeout) + self.receivers(self.finished)}
 
     def stopAnims(self):
-        for anim in self.animations:
-            anim.stop()
+        self.timer.stop()
+        self.stopwatch.stop()
+        self.playing = []
+
+    # Puts the scene back to the state it was made in, so the scene can be used again when the practical is restarted
+    def reset(self):
+        self.stopAnims()
+        self.resetTimer()
+        self.animState = 1
+        self.speed = 1
+
+    # Plays the animations together with the stopwatch, which times the first animation in the list
+    def playAnims(self, anims):
+        self.playing = list(anims)
+        self.clockAnim = self.playing[0]
+        for anim in self.playing:
+            anim.setCurrentTime(0)
+        self.stopwatch.start(self.speed)
+        self.timer.start(FRAME_INTERVAL)
+
+    # Run once per frame, moves the animations on to the stopwatch's time and then updates the clock
+    def advanceFrame(self):
+        runTime = self.stopwatch.runTime()
+        for anim in self.playing:
+            anim.setCurrentTime(runTime)
+        self.updateTimer()
+        if self.clockAnim is not None and self.clockAnim.isFinished():
+            self.animFinished()
 
     def animFinished(self):
         self.button.setText("Start Animation")
         self.timer.stop()
+        # The final reading is the exact length of the animation, however late the last frame was
+        if self.clockAnim is not None:
+            self.stopwatch.stop(self.clockAnim.duration())
+        else:
+            self.stopwatch.stop()
+        for anim in self.playing:
+            anim.setCurrentTime(anim.duration())
+        self.playing = []
+        self.updateTimer()
+        self.finished.emit()
 
     def pauseAnims(self):
         self.timer.stop()
-        for anim in self.animations:
-            anim.pause()
+        self.stopwatch.pause()
 
     def resumeAnims(self):
-        self.timer.start(10 * self.speed)
-        for anim in self.animations:
-            anim.start()
+        self.stopwatch.resume()
+        self.timer.start(FRAME_INTERVAL)
+
+    # Real time of the practical in ms, never past the end of the animation being timed
+    def elapsedTime(self):
+        animTime = self.stopwatch.elapsed()
+        if self.clockAnim is not None:
+            animTime = min(animTime, self.clockAnim.duration() / self.speed)
+        return animTime
+
+    # Shows the time on the clock as seconds:hundredths, the label is only changed when the text is different
+    def updateTimer(self):
+        hundredths = int(self.elapsedTime() // 10)
+        clockString = str(hundredths // 100) + ":" + str(hundredths % 100).zfill(2)
+        if clockString != self.clock.text():
+            self.clock.setText(clockString)
+
+    def resetTimer(self):
+        self.timer.stop()
+        self.stopwatch.reset()
+        self.clockAnim = None
+        self.playing = []
+        self.clock.setText("00:00")
 
     def changeSpeed(self, speed):
-        if speed == 1 or speed == 10:
-            self.speed = 11 - speed
-        else:
-            self.speed = 10 - speed
+        self.speed = physics.animationSpeed(speed)
 
     def getAnimState(self):
         return self.animState
@@ -1331,7 +1984,9 @@ class RampFall(AnimScene):
     def __init__(self, button, choice):
         super(RampFall, self).__init__(button, choice)
 
-        self.initView()
+        # The ball slides down the ramp without friction unless the model is replaced by one with inertia or rolling
+        # resistance, which raises a ValueError if the ball wouldn't roll down the ramp at all
+        self.model = physics.RampFallModel()
 
     def initView(self):
         super(RampFall, self).initView()
@@ -1345,101 +2000,73 @@ class RampFall(AnimScene):
         if self.choice == 1:
             self.ball = GraphicsObject(resource_path("./img/ball.png"))
             self.ramp = GraphicsObject(resource_path("./img/ramp1.png"))
+            self.heightBox = self.createLabel("", QRect(-200, 100, 200, 50))
         else:
             self.ball = MovableImage(40, 40, resource_path("./img/ball.png"))
             self.ruler = MovableImage(460, 505, resource_path("./img/ruler.png"))
             self.ramp = GraphicsObject(resource_path("./img/ramp1.png"))
-            pix = QPixmap(resource_path("./img/ruler.png"))
-            rotated = pix.transformed(QTransform().rotate(60), Qt.SmoothTransformation)
+            rotated = loadPixmap(resource_path("./img/ruler.png"), rotation=60)
             self.ruler.setPixmap(rotated)
             self.ruler.item = QGraphicsPixmapItem(rotated)
 
+        self.ballAnim = FrameAnimation(self.ball)
+        self.animations.append(self.ballAnim)
+
     def createScene(self):
         if self.choice == 1:
             self.addItem(self.ball.item)
             self.addItem(self.ramp.item)
+            self.addItem(self.heightBox)
         else:
             self.addWidget(self.ruler)
             self.addItem(self.ramp.item)
             self.addWidget(self.ball)
 
-    # Timer works by setting a 10ms timer, which when finished runs the updateTimer subroutine
-    # Subroutine adds 1 to the text in the clock QLabel, repeated every time the timer is finished until the animation is completely finished or paused
-    def updateTimer(self):
-        self.milli += 1
-        if self.milli == 100:
-            self.milli = 0
-            self.seconds += 1
-        if self.milli >= 0 and self.milli <= 9:
-            strMilli = "0" + str(self.milli)
-        else:
-            strMilli = str(self.milli)
-        clockString = str(self.seconds) + ":" + strMilli
-        self.clock.setText(clockString)
-
-    def resetTimer(self):
-        self.milli = 0
-        self.seconds = 0
-        self.clock.setText("00:00")
-
     # Creates a still image of the setup of the practical
     def still(self, state, width, height, text):
-        self.createScene()
+        self.buildScene()
         self.resetTimer()
         self.timer.stop()
-        self.heightBox = QLineEdit()
-        self.heightBox.setReadOnly(True)
-        self.heightBox.setAlignment(Qt.AlignCenter)
-        self.heightBox.setFont(QFont("Arial", 10))
         self.heightBox.setText(text)
-        self.heightBox.setGeometry(-200, 100, 200, 50)
-
-        self.addWidget(self.heightBox)
         self.animState = state
 
         self.ball.item.setPos(width, height)
 
     # Creates the animations for the ball, setting the position of the ball at the start and at the end
-    def drop(self, width, height, state, base, text):
+    # The ball follows the trajectory of a ball rolling the given length (in metres) down the ramp
+    def drop(self, width, height, state, length, text):
         self.animState = state
-        self.base = base
+        self.trajectory = self.model.trajectory(length)
+        self.base = self.trajectory.durationMs()
         self.heightBox.setText(text)
 
         self.ball.item.setPos(width, height)
 
-        self.ballAnim = QPropertyAnimation(self.ball, b"position")
         self.ballAnim.setStartValue(QPointF(width, height))
         self.ballAnim.setEndValue(QPointF(-18, 210))
-        self.ballAnim.setEasingCurve(QEasingCurve.InCubic)
-
-        self.animations.append(self.ballAnim)
+        self.ballAnim.setEasingCurve(self.trajectory)
 
     # Creates a scene with the objects used in the practical, which can then be used by the user
     def DIYAnim(self):
-        self.createScene()
-        self.ballAnim = QPropertyAnimation(self.ball, b"position")
+        self.buildScene()
 
         self.ruler.move(-100, 0)
         self.ball.move(100, 250)
         self.ramp.item.setPos(-100, 243)
 
-        self.ballAnim.setEasingCurve(QEasingCurve.InCubic)
-        self.animations.append(self.ballAnim)
-
     # Starts the animation and starts the timer
     # For the DIY window, the procedure calculates the time taken for the ball to reach the bottom of the ramp by calculating the distance
     def startAnims(self):
         self.resetTimer()
         if self.choice == 1:
-            self.ballAnim.setDuration(self.speed * self.base)
+            self.ballAnim.setDuration(int(self.speed * self.base))
         else:
             self.ballPos = self.ball.pos()
-            self.height = ((((self.ballPos.x() + 100) ** 2) + ((self.ballPos.y() - 455) ** 2)) ** (0.5)) / 503
-            sinTheta = math.sin(math.pi / 6)
-            self.base = (((2 * self.height) / (9.81 * sinTheta)) ** (0.5) * 1000)
-            if self.base == 0:
-                self.base = 1
-            self.ballAnim.setDuration(self.speed * self.base)
+            self.height = self.model.lengthFromScene(self.ballPos.x(), self.ballPos.y())
+            self.trajectory = self.model.trajectory(self.height)
+            self.base = max(self.trajectory.durationMs(), 1)
+            self.ballAnim.setDuration(int(self.speed * self.base))
+            self.ballAnim.setEasingCurve(self.trajectory)
             self.rulerPos = self.ruler.pos()
 
             self.ballAnim.setStartValue(self.ballPos)
@@ -1449,12 +2076,18 @@ class RampFall(AnimScene):
 
             self.ball.setHidden(True)
             self.ball.move(self.endPos)
-            self.addItem(self.ball.item)
+            if self.ball.item.scene() is not self:
+                self.addItem(self.ball.item)
             self.ball.item.setPos(self.ballPos)
 
-        self.ballAnim.start()
-        self.timer.start(10 * self.speed)
-        self.ballAnim.finished.connect(self.animFinished)
+        self.playAnims([self.ballAnim])
+
+    # A DIY drop which was stopped part way leaves the ball's scene item in place of the ball
+    def reset(self):
+        super(RampFall, self).reset()
+        if self.choice == 2 and self.ball.item.scene() is self:
+            self.removeItem(self.ball.item)
+            self.ball.setHidden(False)
 
     def animFinished(self):
         super(RampFall, self).animFinished()
@@ -1468,7 +2101,7 @@ class VerticalFall(AnimScene):
     def __init__(self, button, choice):
         super(VerticalFall, self).__init__(button, choice)
 
-        self.initView()
+        self.model = physics.VerticalFallModel()
 
     def initView(self):
         super(VerticalFall, self).initView()
@@ -1479,85 +2112,62 @@ class VerticalFall(AnimScene):
         if self.choice == 1:
             self.ball = GraphicsObject(resource_path("./img/ball.png"))
             self.ruler = GraphicsObject(resource_path("./img/ruler.png"))
+            self.heightBox = self.createLabel("", QRect(-200, 245, 150, 50))
         else:
             self.ball = MovableImage(40, 40, resource_path("./img/ball.png"))
             self.ruler = MovableImage(50, 505, resource_path("./img/ruler.png"))
 
+        self.ballAnim = FrameAnimation(self.ball)
+        self.animations.append(self.ballAnim)
+
     def createScene(self):
         if self.choice == 1:
             self.addItem(self.ball.item)
             self.addItem(self.ruler.item)
+            self.addItem(self.heightBox)
         else:
             self.addWidget(self.ruler)
             self.addWidget(self.ball)
 
-    def updateTimer(self):
-        self.milli += 1
-        if self.milli == 100:
-            self.milli = 0
-            self.seconds += 1
-        if self.milli >= 0 and self.milli <= 9:
-            strMilli = "0" + str(self.milli)
-        else:
-            strMilli = str(self.milli)
-        clockString = str(self.seconds) + ":" + strMilli
-        self.clock.setText(clockString)
-
-    def resetTimer(self):
-        self.milli = 0
-        self.seconds = 0
-        self.clock.setText("00:00")
-
     def still(self, state, height, text):
-        self.createScene()
+        self.buildScene()
         self.resetTimer()
         self.timer.stop()
-        self.heightBox = QLineEdit()
-        self.heightBox.setReadOnly(True)
-        self.heightBox.setAlignment(Qt.AlignCenter)
-        self.heightBox.setFont(QFont("Arial", 10))
         self.heightBox.setText(text)
-        self.heightBox.setGeometry(-200, 245, 150, 50)
-
-        self.addWidget(self.heightBox)
         self.animState = state
 
         self.ball.item.setPos(100, height)
         self.ruler.item.setPos(0, 38)
 
-    def drop(self, height, state, base, text):
+    # The ball follows the trajectory of a ball falling the given distance (in metres)
+    def drop(self, height, state, distance, text):
         self.animState = state
-        self.base = base
+        self.trajectory = self.model.trajectory(distance)
+        self.base = self.trajectory.durationMs()
         self.heightBox.setText(text)
 
         self.ball.item.setPos(100, height)
 
-        self.ballAnim = QPropertyAnimation(self.ball, b"position")
         self.ballAnim.setStartValue(QPointF(100, height))
         self.ballAnim.setEndValue(QPointF(100, 503))
-        self.ballAnim.setEasingCurve(QEasingCurve.InCubic)
-        self.animations.append(self.ballAnim)
+        self.ballAnim.setEasingCurve(self.trajectory)
 
     def DIYAnim(self):
-        self.createScene()
-        self.ballAnim = QPropertyAnimation(self.ball, b"position")
+        self.buildScene()
         self.ruler.move(-100, 0)
         self.ball.move(0, -38)
 
-        self.ballAnim.setEasingCurve(QEasingCurve.InCubic)
-        self.animations.append(self.ballAnim)
-
     def startAnims(self):
         self.resetTimer()
         if self.choice == 1:
-            self.ballAnim.setDuration(self.speed * self.base)
+            self.ballAnim.setDuration(int(self.speed * self.base))
         else:
             self.ballPos = self.ball.pos()
-            self.height = (465 - self.ballPos.y()) / 503
-            self.base = (((2 * self.height) / 9.81) ** (0.5) * 1000)
-            if self.base == 0:
-                self.base = 1
-            self.ballAnim.setDuration(self.speed * self.base)
+            self.height = self.model.heightFromScene(self.ballPos.y())
+            self.trajectory = self.model.trajectory(self.height)
+            self.base = max(self.trajectory.durationMs(), 1)
+            self.ballAnim.setDuration(int(self.speed * self.base))
+            self.ballAnim.setEasingCurve(self.trajectory)
             self.rulerPos = self.ruler.pos()
 
             self.ballAnim.setStartValue(self.ballPos)
@@ -1566,12 +2176,17 @@ class VerticalFall(AnimScene):
             self.ballAnim.setEndValue(self.endPos)
 
             self.ball.setHidden(True)
-            self.addItem(self.ball.item)
+            if self.ball.item.scene() is not self:
+                self.addItem(self.ball.item)
             self.ball.item.setPos(self.ballPos)
 
-        self.ballAnim.start()
-        self.timer.start(10 * self.speed)
-        self.ballAnim.finished.connect(self.animFinished)
+        self.playAnims([self.ballAnim])
+
+    def reset(self):
+        super(VerticalFall, self).reset()
+        if self.choice == 2 and self.ball.item.scene() is self:
+            self.removeItem(self.ball.item)
+            self.ball.setHidden(False)
 
     def animFinished(self):
         super(VerticalFall, self).animFinished()
@@ -1587,82 +2202,82 @@ class PlanckAnim(AnimScene):
         super(PlanckAnim, self).__init__(button, choice)
 
         self.base = 5000
-        self.unit = 0
         self.choice = choice
         self.begin = None
         self.end = None
         self.circuitConnected = False
         self.wires = []
-        self.initView()
+        self.netlist = None
+        self.solver = None
 
     # Creates the objects and sets the colour of the LED as white, which then changes as the animation is run
     def initView(self):
         super(PlanckAnim, self).initView()
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.updateTimer)
 
         self.createObjects()
-        self.clock.deleteLater()
-        self.voltage = QLabel()
-        self.voltage.setFont(QFont("Arial", 15))
-        self.voltage.setAlignment(Qt.AlignCenter)
-        self.voltage.setText("0.00")
+        # The voltmeter reading is shown instead of the clock
+        self.removeItem(self.clock)
+        self.voltage = SceneText("0.00")
 
         self.bulb = QGraphicsEllipseItem(0, 0, 86, 86)
         self.bulb.setBrush(QColor(255, 255, 255))
-        self.red = 255
-        self.blue = 255
-        self.green = 255
-        self.constant = 255
         self.led = 700
+        self.ledModel = physics.LedThresholdModel(self.led)
 
         if self.choice == 1:
             self.voltage.setGeometry(348, 470, 64, 40)
 
-    # Once the voltage value crosses the threshold value, the colour of the LED changes
+    # The voltage rises by 1V for every second of the animation
+    # Once the voltage value crosses the threshold value, the colour of the LED changes by one step for every 0.01V
     def updateTimer(self):
-        self.milli += 1
-        if self.milli == 100:
-            self.milli = 0
-            self.unit += 1
-        if self.milli >= 0 and self.milli <= 9:
-            strMilli = "0" + str(self.milli)
-        else:
-            strMilli = str(self.milli)
-
-        voltString = str(self.unit) + "." + strMilli
+        hundredths = int(self.elapsedTime() // 10)
+        voltString = str(hundredths // 100) + "." + str(hundredths % 100).zfill(2)
 
-        if self.led == 700:
-            if float(voltString) >= 1.7 and self.blue != 0:
-                self.blue = self.blue - 1
-                self.green = self.green - 1
-        elif self.led == 450:
-            if float(voltString) >= 2.7 and self.red != 0:
-                self.red = self.red - 1
-                self.green = self.green - 1
+        colour = QColor(*self.ledModel.exampleColour(hundredths / 100))
+        if colour != self.bulb.brush().color():
+            self.bulb.setBrush(colour)
 
-        self.bulb.setBrush(QColor(self.red, self.green, self.blue))
-
-        self.voltage.setText(voltString)
+        if voltString != self.voltage.text():
+            self.voltage.setText(voltString)
 
     def resetTimer(self):
         self.timer.stop()
-        self.milli = 0
-        self.unit = 0
-        self.red = 255
-        self.blue = 255
-        self.green = 255
-        self.constant = 255
-        self.bulb.setBrush(QColor(255, (self.blue), (self.green)))
+        self.stopwatch.reset()
+        self.clockAnim = None
+        self.playing = []
+        self.ledModel.reset()
+        self.bulb.setBrush(QColor(*self.ledModel.colour()))
         self.voltage.setText("0.00")
 
+    # The DIY circuit is unwired and the first LED put back
+    def reset(self):
+        super(PlanckAnim, self).reset()
+        self.begin = None
+        self.end = None
+        self.circuitConnected = False
+        if self.choice == 2 and self.netlist is not None:
+            self.removeWires()
+            self.slider.setValue(500)
+        self.changeLED(700)
+
+    # The colour only depends on the voltage, so in the DIY circuit the new LED is shown straight away
     def changeLED(self, led):
         self.led = led
+        self.ledModel.changeLED(led)
+        self.updateCircuit()
 
     def createObjects(self):
         if self.choice == 1:
             self.circuit = GraphicsObject(resource_path("./img/circuit2.png"))
             self.slider = GraphicsObject(resource_path("./img/slider.png"))
+            self.compBox1 = self.createLabel("Variable Resistor", QRect(35, 150, 150, 50))
+            self.compBox2 = self.createLabel("Bulb", QRect(350, 290, 75, 50))
+            self.compBox3 = self.createLabel("Voltmeter", QRect(450, 500, 100, 50))
+
+            self.sliderAnim = FrameAnimation(self.slider)
+            self.sliderAnim.setStartValue(QPointF(180, 255))
+            self.sliderAnim.setEndValue(QPointF(25, 255))
+            self.animations.append(self.sliderAnim)
         else:
             self.supply = GraphicsObject(resource_path("./img/supply.png"))
             self.voltmeter = GraphicsObject(resource_path("./img/voltmeter.png"))
@@ -1689,90 +2304,36 @@ class PlanckAnim(AnimScene):
             self.node6 = QGraphicsRectItem(0, 0, 10, 10)
             self.node6.setBrush(QColor(0, 0, 0))
 
+    # The circuit the student has wired is solved again for each position of the slider, the voltmeter shows the
+    # voltage across its terminals and the LED lights from the voltage across it, so wiring mistakes show up as they
+    # would in the lab
     def updateVoltage(self):
-        if self.circuitConnected:
-            sliderValue = round(((self.slider.value()) / 100), 2)
-            voltValue = round((5 - sliderValue), 2)
-            self.voltage.setText(str(voltValue))
-            if self.led == 700:
-                if voltValue >= 1.7 and voltValue > self.oldValue and self.constant != 0:
-                    self.constant = self.constant - 5
-                    self.blue = self.blue - 5
-                    self.green = self.green - 5
-                elif voltValue < self.oldValue and voltValue <= 3.23 and self.constant != 255:
-                    self.constant = self.constant + 5
-                    self.blue = self.blue + 5
-                    self.green = self.green + 5
-            elif self.led == 630:
-                if voltValue >= 1.95 and voltValue > self.oldValue and self.constant != 0:
-                    self.constant = self.constant - 5
-                    self.green = self.green - 2
-                    self.blue = self.blue - 5
-                elif voltValue < self.oldValue and voltValue <= 3.48 and self.constant != 255:
-                    self.constant = self.constant + 5
-                    self.green = self.green + 2
-                    self.blue = self.blue + 5
-            elif self.led == 580:
-                if voltValue >= 2.1 and voltValue > self.oldValue and self.constant != 0:
-                    self.constant = self.constant - 5
-                    self.blue = self.blue - 5
-                elif voltValue < self.oldValue and voltValue <= 3.63 and self.constant != 255:
-                    self.constant = self.constant + 5
-                    self.blue = self.blue + 5
-            elif self.led == 520:
-                if voltValue >= 2.35 and voltValue > self.oldValue and self.constant != 0:
-                    self.constant = self.constant - 5
-                    self.red = self.red - 5
-                    self.blue = self.blue - 5
-                elif voltValue < self.oldValue and voltValue <= 3.88 and self.constant != 255:
-                    self.constant = self.constant + 5
-                    self.red = self.red + 5
-                    self.blue = self.blue + 5
-            elif self.led == 450:
-                if voltValue >= 2.75 and voltValue > self.oldValue and self.constant != 0:
-                    self.constant = self.constant - 5
-                    self.red = self.red - 5
-                    self.green = self.green - 5
-                elif voltValue < self.oldValue and voltValue <= 4.28 and self.constant != 255:
-                    self.constant = self.constant + 5
-                    self.red = self.red + 5
-                    self.green = self.green + 5
-            elif self.led == 420:
-                if voltValue >= 2.9 and voltValue > self.oldValue and self.constant != 0:
-                    self.constant = self.constant - 5
-                    self.red = self.red - 2
-                    self.green = self.green - 5
-                elif voltValue < self.oldValue and voltValue <= 4.43 and self.constant != 255:
-                    self.constant = self.constant + 5
-                    self.red = self.red + 2
-                    self.green = self.green + 5
-            elif self.led == 380:
-                if voltValue >= 3.2 and voltValue > self.oldValue and self.constant != 0:
-                    self.constant = self.constant - 5
-                    self.red = self.red - 4.5
-                    self.green = self.green - 5
-                    self.blue = self.blue - 4
-                elif voltValue < self.oldValue and voltValue <= 4.73 and self.constant != 255:
-                    self.constant = self.constant + 5
-                    self.red = self.red + 4.5
-                    self.green = self.green + 5
-                    self.blue = self.blue + 4
-
-            self.bulb.setBrush(QColor(self.red, self.green, self.blue))
-            self.oldValue = voltValue
+        if self.solver is not None:
+            reading = self.solver.solve(self.slider.value())
+            self.voltage.setText(str(round(reading.voltmeter, 2)))
+            self.bulb.setBrush(QColor(*self.ledModel.voltageColour(reading.ledVoltage)))
+
+    # Builds the solver for the circuit as it is wired now, used whenever a wire or the LED is changed
+    def updateCircuit(self):
+        if self.choice == 2 and self.netlist is not None:
+            self.solver = circuit.CircuitSolver(self.netlist, self.ledModel.threshold)
+            self.updateVoltage()
 
     def createScene(self):
         if self.choice == 1:
             self.addItem(self.bulb)
             self.addItem(self.circuit.item)
             self.addItem(self.slider.item)
-            self.addWidget(self.voltage)
+            self.addItem(self.voltage)
+            self.addItem(self.compBox1)
+            self.addItem(self.compBox2)
+            self.addItem(self.compBox3)
         else:
             self.addItem(self.supply.item)
             self.addItem(self.voltmeter.item)
             self.addItem(self.vResistor.item)
             self.addItem(self.bulb)
-            self.addWidget(self.voltage)
+            self.addItem(self.voltage)
             self.addWidget(self.slider)
             self.addItem(self.node1)
             self.addItem(self.node2)
@@ -1785,32 +2346,13 @@ class PlanckAnim(AnimScene):
     def changeConnected(self, boolean):
         self.circuitConnected = boolean
 
-    def createLabel(self, text):
-        label = QLineEdit()
-        label.setReadOnly(True)
-        label.setAlignment(Qt.AlignCenter)
-        label.setFont(QFont("Arial", 10))
-        label.setText(text)
-        self.addWidget(label)
-        return label
-
     def still(self, state, led):
-        self.createScene()
+        self.buildScene()
         self.resetTimer()
         self.button.setText("Start Animation")
-        self.compBox1 = self.createLabel("Variable Resistor")
-        self.compBox1.setGeometry(35, 150, 150, 50)
-
-        self.compBox2 = self.createLabel("Bulb")
-        self.compBox2.setGeometry(350, 290, 75, 50)
-
-        self.compBox3 = self.createLabel("Voltmeter")
-        self.compBox3.setGeometry(450, 500, 100, 50)
+        self.stopAnims()
 
-        for anim in self.animations:
-            anim.stop()
-
-        self.led = led
+        self.changeLED(led)
         self.animState = state
         self.bulb.setPos(348, 343)
         self.circuit.item.setPos(0, 0)
@@ -1818,17 +2360,16 @@ class PlanckAnim(AnimScene):
 
     def slide(self, state):
         self.animState = state
-        self.sliderAnim = QPropertyAnimation(self.slider, b"position")
-        self.sliderAnim.setStartValue(QPointF(180, 255))
-        self.sliderAnim.setEndValue(QPointF(25, 255))
 
-        self.animations.append(self.sliderAnim)
-
-    # For the DIY view, a 2D list is created which stores each component in the circuit, the start and end position of the component, and the index of the components which it connects with
+    # For the DIY view, each component of the circuit is registered with the terminals wires snap to and the components
+    # it can be wired to
     def DIYAnim(self):
-        self.oldValue = 0
-        self.createScene()
+        self.buildScene()
         self.components = []
+        self.componentItems = {}
+        self.netlist = circuit.Netlist()
+        self.wireNets = {}
+        self.updateCircuit()
         self.supply.item.setPos(0, -300)
         self.vResistor.item.setPos(-200, -170)
         self.slider.move(-190, -135)
@@ -1843,110 +2384,136 @@ class PlanckAnim(AnimScene):
         self.node5.setPos(-130, 150)
         self.node6.setPos(300, 150)
 
-        self.components.append([self.supply.item, QPointF(-1, -301), QPointF(184, -197), 4, 5, 0, 2])
-        self.components.append([self.bulb, QPointF(49, -41), QPointF(137, 47), 6, 7, 0, 2])
-        self.components.append([self.voltmeter.item, QPointF(50, 100), QPointF(137, 201), 8, 9, 0, 2])
-        self.components.append([self.vResistor.item, QPointF(-200, -170), QPointF(-1, -84), 4, 6, 0, 2])
-        self.components.append([self.node1, QPointF(-131, -251), QPointF(-119, -239), 0, 3, 0, 2])
-        self.components.append([self.node2, QPointF(299, -251), QPointF(311, -239), 0, 7, 0, 2])
-        self.components.append([self.node3, QPointF(-131, -1), QPointF(-119, 11), 3, 1, 8, 0, 3])
-        self.components.append([self.node4, QPointF(299, -1), QPointF(311, 11), 5, 1, 9, 0, 3])
-        self.components.append([self.node5, QPointF(-131, 149), QPointF(-119, 161), 6, 2, 0, 2])
-        self.components.append([self.node6, QPointF(299, 149), QPointF(311, 161), 7, 2, 0, 2])
+        centre = [QPointF(5, 5)]
+        self.addComponent("supply", self.supply.item, [QPointF(0, 51), QPointF(183, 51)])
+        self.addComponent("bulb", self.bulb, [QPointF(0, 43), QPointF(86, 43)])
+        self.addComponent("voltmeter", self.voltmeter.item, [QPointF(0, 50), QPointF(86, 50)])
+        self.addComponent("resistor", self.vResistor.item, [QPointF(99, 0), QPointF(99, 85)])
+        self.addComponent("node1", self.node1, centre)
+        self.addComponent("node2", self.node2, centre)
+        self.addComponent("node3", self.node3, centre)
+        self.addComponent("node4", self.node4, centre)
+        self.addComponent("node5", self.node5, centre)
+        self.addComponent("node6", self.node6, centre)
+
+    # The slider of the DIY circuit is connected to the solver as well as the frame clock
+    def debugCounts(self):
+        counts = super(PlanckAnim, self).debugCounts()
+        if self.choice == 2:
+            counts["connections"] += self.slider.receivers(self.slider.valueChanged)
+        return counts
+
+    def addComponent(self, name, item, terminals):
+        component = CircuitComponent(name, item, terminals)
+        self.components.append(component)
+        self.componentItems[item] = component
+        return component
+
+    # Items close to the point, the scene keeps its items in a BSP tree so this doesn't get slower for every component
+    # or wire added
+    def itemsNear(self, point):
+        area = QRectF(point.x() - SNAP_DISTANCE, point.y() - SNAP_DISTANCE, 2 * SNAP_DISTANCE, 2 * SNAP_DISTANCE)
+        return self.items(area, Qt.IntersectsItemBoundingRect)
+
+    # Finds the terminal nearest to the point, returning the name of the terminal and its position
+    def terminalAt(self, point):
+        nearest = None
+        for item in self.itemsNear(point):
+            component = self.componentItems.get(item)
+            if component is None:
+                continue
+            index, position = component.nearestTerminal(point)
+            if nearest is None or QLineF(point, position).length() < QLineF(point, nearest[1]).length():
+                nearest = (circuit.terminal(component.name, index), position)
+        return nearest or (None, None)
+
+    # Wire drawn closest to the point, if there is one near it
+    def wireAt(self, point):
+        wires = [item for item in self.itemsNear(point) if item in self.wireNets]
+        if not wires:
+            return None
+        return min(wires, key=lambda wire: QLineF(point, wire.line().center()).length())
+
+    def circuitComplete(self):
+        return self.netlist.isPlanckCircuit()
 
     def getComponents(self):
         return self.components
 
     def startAnims(self):
         self.resetTimer()
-        self.timer.start(10 * self.speed)
         self.sliderAnim.setDuration(self.speed * self.base)
-        self.sliderAnim.finished.connect(self.animFinished)
-        for anim in self.animations:
-            anim.start()
+        self.playAnims([self.sliderAnim])
 
     # Procedures which define what happens when the user presses and releases the mouse
     # A wire (line object) is drawn when the mouse is pressed and released
+    # While the mouse is held down, the same preview line is moved to follow it rather than a new line being added
+    # Right clicking on a wire removes just that wire
     def mousePressEvent(self, event):
-        if self.choice == 2 and not self.circuitConnected:
+        if self.choice == 2 and not self.circuitConnected and event.button() == Qt.RightButton:
+            wire = self.wireAt(event.scenePos())
+            if wire is not None:
+                self.removeWire(wire)
+        elif self.choice == 2 and not self.circuitConnected:
             self.begin = self.end = event.scenePos()
-            self.update()
+            self.prevLine.setLine(QLineF(self.begin, self.end))
+            self.prevLine.show()
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
         if self.choice == 2 and not self.circuitConnected:
             if self.begin is not None:
                 self.end = event.scenePos()
-                self.removeItem(self.prevLine)
-                l = QLineF(self.begin, self.end)
-                wire = QGraphicsLineItem(l)
-                self.addItem(wire)
-                self.prevLine = wire
+                self.prevLine.setLine(QLineF(self.begin, self.end))
         super().mouseMoveEvent(event)
 
-    # Procedure checks to see if the wire drawn is connecting 2 adjacent components, if yes, a connection value is added in the components list
+    # The ends of a wire drawn onto components are snapped to their nearest terminals, and a wire joining two terminals
+    # is added to the netlist
     def mouseReleaseEvent(self, event):
-        if self.choice == 2 and not self.circuitConnected:
-            l = QLineF(self.begin, self.end)
-            for component in self.components:
-                startPos = component[1]
-                endPos = component[2]
-                length = len(component)
-                if (l.x1() >= startPos.x() and l.x1() <= endPos.x()) and (
-                        l.y1() >= startPos.y() and l.y1() <= endPos.y()):
-                    validEndComponent1 = self.components[component[3]]
-                    validEndComponent2 = self.components[component[4]]
-
-                    validStartPos1 = validEndComponent1[1]
-                    validEndPos1 = validEndComponent1[2]
-
-                    validStartPos2 = validEndComponent2[1]
-                    validEndPos2 = validEndComponent2[2]
-
-                    length2 = len(validEndComponent1)
-                    length3 = len(validEndComponent2)
-
-                    validStartPos3 = QPoint()
-                    validEndPos3 = QPoint()
-
-                    if length == 8:
-                        validEndComponent3 = self.components[component[5]]
-                        validStartPos3 = validEndComponent3[1]
-                        validEndPos3 = validEndComponent3[2]
-                        length4 = len(validEndComponent3)
-
-                    if (l.x2() >= validStartPos1.x() and l.x2() <= validEndPos1.x()) and (
-                            l.y2() >= validStartPos1.y() and l.y2() <= validEndPos1.y()):
-                        component[length - 2] += 1
-                        validEndComponent1[length2 - 2] += 1
-                    elif (l.x2() >= validStartPos2.x() and l.x2() <= validEndPos2.x()) and (
-                            l.y2() >= validStartPos2.y() and l.y2() <= validEndPos2.y()):
-                        component[length - 2] += 1
-                        validEndComponent2[length3 - 2] += 1
-                    elif (l.x2() >= validStartPos3.x() and l.x2() <= validEndPos3.x()) and (
-                            l.y2() >= validStartPos3.y() and l.y2() <= validEndPos3.y()):
-                        component[length - 2] += 1
-                        validEndComponent3[length4 - 2] += 1
-
-            w = QGraphicsLineItem(l)
-            self.wires.append(w)
-            self.updateWires()
+        if self.choice == 2 and not self.circuitConnected and self.begin is not None:
+            start, startPos = self.terminalAt(self.begin)
+            end, endPos = self.terminalAt(self.end)
+            l = QLineF(startPos or self.begin, endPos or self.end)
+
+            self.prevLine.hide()
+            self.addWire(l, start, end)
             self.begin = self.end = None
         super().mouseReleaseEvent(event)
 
-    def updateWires(self):
-        for wire in self.wires:
-            self.addItem(wire)
+    # Each wire is added to the scene once, when it is drawn
+    def addWire(self, line, start=None, end=None):
+        wire = QGraphicsLineItem(line)
+        self.wires.append(wire)
+        self.wireNets[wire] = None if start is None or end is None else self.netlist.addWire(start, end)
+        self.addItem(wire)
+        if self.wireNets[wire] is not None:
+            self.updateCircuit()
+        return wire
+
+    # Removing any wire means the circuit has to be checked again, so wires can be drawn again straight away
+    def removeWire(self, wire):
+        self.circuitConnected = False
+        netWire = self.wireNets.pop(wire)
+        if netWire is not None:
+            self.netlist.removeWire(netWire)
+            self.updateCircuit()
+        self.wires.remove(wire)
+        self.removeItem(wire)
+
+    # Removes the last wire drawn
+    def undoWire(self):
+        if self.wires:
+            self.removeWire(self.wires[-1])
 
     def removeWires(self):
-        self.removeItem(self.prevLine)
+        self.prevLine.hide()
         for wire in self.wires:
             self.removeItem(wire)
         self.wires = []
+        self.wireNets = {}
+        self.netlist.clear()
         self.circuitConnected = False
-        for item in self.components:
-            index = len(item) - 2
-            item[index] = 0
+        self.updateCircuit()
 
 
 # Group box class which displays the table used during the practical and defines the default methods
@@ -2023,15 +2590,15 @@ class CalculationVertical(GraphCalcBox):
         mplGraph = MplCanvas(self, width=5, height=4, dpi=100)
         x = np.array([0.050, 0.101, 0.154, 0.210, 0.254, 0.308, 0.357, 0.412])
         y = np.array([0.25, 0.50, 0.75, 1.00, 1.25, 1.50, 1.75, 2.00])
-        self.m, c = np.polyfit(x, y, 1)
+        self.m, c = physics.fitLine(x, y)
         mplGraph.axes.plot(x, y, "x")
         mplGraph.axes.plot(x, self.m * x + c)
 
         mplGraph.axes.set_xlabel('time\u00b2 (s\u00b2)')
         mplGraph.axes.set_ylabel('Distance (m)')
-        mplGraph.axes.grid(b=True, which='major', color='#666666', linestyle='-')
+        mplGraph.axes.grid(True, which='major', color='#666666', linestyle='-')
         mplGraph.axes.minorticks_on()
-        mplGraph.axes.grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
+        mplGraph.axes.grid(True, which='minor', color='#999999', linestyle='-', alpha=0.2)
 
         graphLayout = QVBoxLayout()
 
@@ -2094,15 +2661,15 @@ class CalculationPlanck(GraphCalcBox):
         graph = MplCanvas(self, width=4, height=4, dpi=100)
         x = np.array([1.43, 1.59, 1.72, 1.92, 2.22, 2.38, 2.63])
         y = np.array([1.77, 1.97, 2.12, 2.41, 2.75, 2.97, 3.26])
-        self.m, c = np.polyfit(x, y, 1)
+        self.m, c = physics.fitLine(x, y)
         graph.axes.plot(x, y, "x")
         graph.axes.plot(x, self.m * x + c)
 
         graph.axes.set_xlabel('1/λ (x10^6 m^-1)')
         graph.axes.set_ylabel('Voltage (V)')
-        graph.axes.grid(b=True, which='major', color='#666666', linestyle='-')
+        graph.axes.grid(True, which='major', color='#666666', linestyle='-')
         graph.axes.minorticks_on()
-        graph.axes.grid(b=True, which='minor', color='#999999', linestyle='-', alpha=0.2)
+        graph.axes.grid(True, which='minor', color='#999999', linestyle='-', alpha=0.2)
 
         graphLayout = QVBoxLayout()
         graphLayout.addWidget(graph)
@@ -2119,7 +2686,7 @@ class CalculationPlanck(GraphCalcBox):
         self.workBox = QLabel()
         self.workBox.setAlignment(Qt.AlignCenter)
         self.workBox.setFont(QFont("Arial", 14))
-        planckConstant = ((self.m * 1.6) / 3) * 10
+        planckConstant = physics.LedThresholdModel.planckFromGradient(self.m)
         string1 = "Planck's Constant can be calulcated using the gradient of the graph\n"
         string2 = "The Line of Best Fit follows the equation V = hc/eλ \n"
         string3 = "h = Planck's Constant, Gradient = hc/e \n"
@@ -2149,7 +2716,7 @@ class CalculationRamp(QGroupBox):
         self.layout2 = QVBoxLayout()
         # self.layout2.setAlignment(Qt.AlignCenter)
         diagram = QLabel()
-        pix = QPixmap(resource_path("./img/rampDiagram1.png"))
+        pix = loadPixmap(resource_path("./img/rampDiagram1.png"))
         diagram.setPixmap(pix)
 
         self.layout.addWidget(diagram)
@@ -2200,13 +2767,153 @@ class CalculationRamp(QGroupBox):
         return self.workingOut2
 
 
-# Class definition for the canvas which draws the graph, utilises the matplotlib module
+# Creates the canvas which draws the graph, utilises the matplotlib module
 # Numpy module used alongside to draw the graph
-class MplCanvas(FigureCanvasQTAgg):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi, tight_layout=True)
-        self.axes = fig.add_subplot(111)
-        super(MplCanvas, self).__init__(fig)
+# The canvas is built from the lazily imported backend, so matplotlib is only loaded once a graph is drawn
+def MplCanvas(parent=None, width=5, height=4, dpi=100):
+    backend = plotting()
+    fig = backend.Figure(figsize=(width, height), dpi=dpi, tight_layout=True)
+    canvas = backend.FigureCanvasQTAgg(fig)
+    canvas.axes = fig.add_subplot(111)
+    return canvas
+
+
+# Graph of the readings in a DIY practical's table, kept for the life of the window and updated as readings are entered
+# The axes, grid and labels are drawn once and kept as a background image. The points and line of best fit are animated
+# artists drawn on top of it, so a new reading only redraws them. The whole graph is only drawn again when a point falls
+# outside the axes or the table is cleared or sorted
+class LiveGraph(QWidget):
+    # Space left around the points when the axes are fitted to them, as a fraction of their range
+    MARGIN = 0.1
+
+    def __init__(self, model, pagType):
+        super(LiveGraph, self).__init__()
+        self.model = model
+        self.canvas = MplCanvas(self, width=5, height=4, dpi=100)
+        self.axes = self.canvas.axes
+        self.axes.grid(True, which='major', color='#666666', linestyle='-')
+        self.axes.minorticks_on()
+        self.axes.grid(True, which='minor', color='#999999', linestyle='-', alpha=0.2)
+        self.points, = self.axes.plot([], [], "x", animated=True)
+        self.line, = self.axes.plot([], [], animated=True)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.onDraw)
+
+        graphLayout = QVBoxLayout()
+        graphLayout.addWidget(plotting().NavigationToolbar(self.canvas, self))
+        graphLayout.addWidget(self.canvas)
+        self.setLayout(graphLayout)
+
+        # A reading only changes the point of its own row, anything which moves rows around fits the line again
+        model.dataChanged.connect(lambda topLeft, bottomRight: self.updateRows(topLeft.row(), bottomRight.row()))
+        model.layoutChanged.connect(self.rebuild)
+        model.modelReset.connect(self.rebuild)
+        self.setType(pagType)
+
+    def setType(self, pagType):
+        self.pagType = pagType
+        if self.pagType != "Planck":
+            self.axes.set_xlabel('time\u00b2 (s\u00b2)')
+            self.axes.set_ylabel('Distance (m)')
+        else:
+            self.axes.set_xlabel('1/λ × 10^6')
+            self.axes.set_ylabel('Voltage (V)')
+        self.rebuild()
+
+    # Point plotted for a row of the table, or None if the row has no readings or a value which can't be plotted
+    def rowPoint(self, row):
+        point = self.model.store.point(row)
+        if point is None:
+            return None
+        value, average = point
+        if not value > 0:
+            return None
+        if self.pagType != "Planck":
+            return average, value
+        return 1 / (value * 10 ** -9), average
+
+    def rebuild(self):
+        self.rowPoints = {}
+        self.fit = physics.RunningLine()
+        for row in range(self.model.store.rows):
+            point = self.rowPoint(row)
+            if point is not None:
+                self.rowPoints[row] = point
+                self.fit.add(*point)
+        self.refresh(True)
+
+    def updateRows(self, first, last):
+        changed = False
+        for row in range(first, min(last, self.model.store.rows - 1) + 1):
+            old = self.rowPoints.get(row)
+            new = self.rowPoint(row)
+            if old == new:
+                continue
+            if old is not None:
+                self.fit.remove(*old)
+                del self.rowPoints[row]
+            if new is not None:
+                self.fit.add(*new)
+                self.rowPoints[row] = new
+            changed = True
+        if changed:
+            self.refresh(False)
+
+    # Moves the points and line to the current readings, the axes are only fitted to the points again if told to or if
+    # a point is outside them
+    def refresh(self, rescale):
+        x = np.array([point[0] for point in self.rowPoints.values()])
+        y = np.array([point[1] for point in self.rowPoints.values()])
+        self.points.set_data(x, y)
+
+        gradient = self.fit.gradient()
+        if np.isnan(gradient):
+            self.line.set_data([], [])
+        else:
+            lineX = np.array([x.min(), x.max()])
+            self.line.set_data(lineX, gradient * lineX + self.fit.intercept())
+
+        if len(x):
+            left, right = self.axes.get_xlim()
+            bottom, top = self.axes.get_ylim()
+            outside = x.min() < left or x.max() > right or y.min() < bottom or y.max() > top
+            if rescale or outside:
+                self.axes.set_xlim(*self.limits(x))
+                self.axes.set_ylim(*self.limits(y))
+                rescale = True
+
+        if rescale or self.background is None:
+            self.background = None
+            self.canvas.draw_idle()
+        else:
+            self.blit()
+
+    def limits(self, values):
+        low, high = values.min(), values.max()
+        margin = (high - low) * self.MARGIN or abs(high) * self.MARGIN or 1
+        return low - margin, high + margin
+
+    # Points may have moved while the graph was hidden, which isn't blitted
+    def showEvent(self, event):
+        super(LiveGraph, self).showEvent(event)
+        self.canvas.draw_idle()
+
+    # Redraws only the points and the line over the saved background
+    def blit(self):
+        if not self.isVisible():
+            return
+        self.canvas.restore_region(self.background)
+        self.drawArtists()
+        self.canvas.blit(self.axes.bbox)
+
+    def drawArtists(self):
+        self.axes.draw_artist(self.points)
+        self.axes.draw_artist(self.line)
+
+    # Every time the whole graph is drawn the background is saved before the animated artists are drawn on top of it
+    def onDraw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.axes.bbox)
+        self.drawArtists()
 
 
 # Class definition which creates an graphics object which can be moved around by the user
@@ -2217,11 +2924,11 @@ class MovableImage(QLabel):
 
         self.setStyleSheet("background:transparent")
 
-        self.itemPixmap = QPixmap(imgPath)
+        self.itemPixmap = loadPixmap(imgPath)
         self.item = QGraphicsPixmapItem(self.itemPixmap)
 
         self.setFixedSize(width, height)
-        self.setPixmap(QPixmap(imgPath))
+        self.setPixmap(self.itemPixmap)
         self.drag_start_pos = None
 
     def mousePressEvent(self, event):
@@ -2246,44 +2953,70 @@ class MovableImage(QLabel):
     position = pyqtProperty(QPointF, fset=setPosition)
 
 
-# Merge sort procedure, used when sorting the data in the tables used in the DIY window
-def mergeSort(array):
-    if len(array) > 1:
-        mid = len(array) // 2
-        L = array[:mid]
-        R = array[mid:]
-
-        mergeSort(L)
+# Runs a procedure once a widget has been painted for the first time
+class FirstPaintWatcher(QObject):
+    def __init__(self, widget, callback):
+        super(FirstPaintWatcher, self).__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
 
-        mergeSort(R)
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Queued so the callback runs after the paint event has been handled
+            QTimer.singleShot(0, self.callback)
+        return False
 
-        i = 0
-        j = 0
-        k = 0
 
-        while i < len(L) and j < len(R):
-            if L[i] < R[j]:
-                array[k] = L[i]
-                i = i + 1
-            else:
-                array[k] = R[j]
-                j = j + 1
-            k = k + 1
-
-        while i < len(L):
-            array[k] = L[i]
-            i = i + 1
-            k = k + 1
-
-        while j < len(R):
-            array[k] = R[j]
-            k = k + 1
-            j = j + 1
+# Work done in the background once the menu is on screen: loads the plotting modules and builds any image variants
+# missing from the asset cache, so neither has to happen when the user opens a practical
+def backgroundStartup(warmUp, dpr, timings=None):
+    if warmUp:
+        warmStart = time.perf_counter()
+        importlib.import_module("numpy")
+        plotting()
+        if timings is not None:
+            timings["plotting warm-up (background)"] = time.perf_counter() - warmStart
+    assetStore.buildAll([dpr])
 
 
 def main():
-    app = QApplication(sys.argv)
-    window = MenuWindow()
+    parser = argparse.ArgumentParser(description="Virtual Lab")
+    parser.add_argument("--build-assets", action="store_true",
+                        help="build the scaled and rotated image variants into the asset cache and exit")
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="do not import the plotting modules in the background once the menu is shown")
+    parser.add_argument("--startup-times", action="store_true",
+                        help="print how long each stage of start up takes, then exit")
+    args, qtArgs = parser.parse_known_args()
+
+    timings = {"imports": importTime - startTime}
+    app = QApplication(sys.argv[:1] + qtArgs)
+    timings["QApplication created"] = time.perf_counter() - startTime
+
+    if args.build_assets:
+        built = assetStore.buildAll(sorted({1.0, 2.0, app.devicePixelRatio()}))
+        print("Built {} image variants in {}".format(built, assetStore.cacheDir))
+        return
+
+    window = navigator.open(MenuWindow)
+    timings["menu window created"] = time.perf_counter() - startTime
+
+    def firstPaint():
+        timings["first paint"] = time.perf_counter() - startTime
+        thread = threading.Thread(target=backgroundStartup, daemon=True,
+                                  args=(not args.no_warmup, app.devicePixelRatio(), timings))
+        thread.start()
+
+        if args.startup_times:
+            thread.join()
+            for stage, seconds in timings.items():
+                print("{:<32}{:8.1f} ms".format(stage, seconds * 1000))
+            print("{:<32}{}".format("plotting modules loaded", "matplotlib" in sys.modules))
+            app.quit()
+
+    FirstPaintWatcher(window, firstPaint)
+
     sys.exit(app.exec_())
 
 
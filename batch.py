@@ -0,0 +1,329 @@
+# Batch runs of the practicals without the GUI
+# Run with: python batch.py <command> (see python batch.py --help)
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import physics
+
+# Readings each student takes, matching the tables used in the calculation pages
+VERTICAL_HEIGHTS = np.array([0.25, 0.50, 0.75, 1.00, 1.25, 1.50, 1.75, 2.00])
+RAMP_LENGTHS = np.array([0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+PLANCK_WAVELENGTHS = np.array([700, 630, 580, 520, 450, 420, 380])
+REPEATS = 3
+
+# Size of the equipment scales, times are read off a stopwatch, lengths off a ruler and voltages off a voltmeter
+STOPWATCH_RESOLUTION = 0.01
+RULER_RESOLUTION = 0.001
+VOLTMETER_RESOLUTION = 0.01
+
+
+# Sizes of the mistakes a student makes when taking a reading
+# Each press of the stopwatch is late by a random reaction time, reading the ruler from an angle moves the reading by
+# the parallax error, and the LED is judged to have started lighting a little before or after it really does
+class MeasurementNoise:
+    def __init__(self, reactionSpread=0.04, parallax=0.002, ledJudgement=0.02):
+        self.reactionSpread = reactionSpread
+        self.parallax = parallax
+        self.ledJudgement = ledJudgement
+
+
+# Rounds readings down to the scale of the instrument, as a stopwatch or a ruler shows them
+def readScale(values, resolution):
+    return np.floor(values / resolution + 1e-9) * resolution
+
+
+def readNearest(values, resolution):
+    return np.round(values / resolution) * resolution
+
+
+# Times read off a stopwatch for drops lasting the given times, with one row of readings for each student
+# Only the difference between the reaction times when starting and stopping the stopwatch changes the time, and the
+# difference of two normally distributed reaction times is normally distributed with √2 times the spread
+def stopwatchReadings(rng, times, shape, noise):
+    delay = rng.normal(0, noise.reactionSpread * np.sqrt(2), shape)
+    return readScale(np.clip(times + delay, 0, None), STOPWATCH_RESOLUTION)
+
+
+def rulerReadings(rng, lengths, shape, noise):
+    return readNearest(lengths + rng.normal(0, noise.parallax, shape), RULER_RESOLUTION)
+
+
+# Both drop practicals are worked out the same way: the average of time² for each distance is plotted against the
+# distance and g comes from the gradient of the line of best fit
+def simulateDrop(rng, students, distances, model, noise):
+    shape = (students, len(distances), REPEATS)
+    measured = rulerReadings(rng, distances[:, None], shape[:2] + (1,), noise)
+    times = stopwatchReadings(rng, model.dropTime(distances)[:, None], shape, noise)
+    averageTimeSquared = (times ** 2).mean(axis=2)
+    return model.gFromGradient(physics.fitGradients(averageTimeSquared, measured[:, :, 0]))
+
+
+def simulateVertical(rng, students, noise):
+    return simulateDrop(rng, students, VERTICAL_HEIGHTS, physics.VerticalFallModel(), noise)
+
+
+def simulateRamp(rng, students, noise):
+    return simulateDrop(rng, students, RAMP_LENGTHS, physics.RampFallModel(), noise)
+
+
+# Voltages at which each student sees the LEDs start to light, averaged and plotted against 1/λ to find h
+def simulatePlanck(rng, students, noise):
+    shape = (students, len(PLANCK_WAVELENGTHS), REPEATS)
+    thresholds = physics.LedThresholdModel.thresholdVoltage(PLANCK_WAVELENGTHS)[:, None]
+    voltages = readNearest(thresholds + rng.normal(0, noise.ledJudgement, shape), VOLTMETER_RESOLUTION)
+    inverseWavelength = np.round(1000 / PLANCK_WAVELENGTHS, 2)
+    gradients = physics.fitGradients(np.broadcast_to(inverseWavelength, shape[:2]), voltages.mean(axis=2))
+    return physics.LedThresholdModel.planckFromGradient(gradients)
+
+
+# The simulation for each practical, with the accepted value the results are compared against
+PRACTICALS = {
+    "vertical": (simulateVertical, physics.G),
+    "ramp": (simulateRamp, physics.G),
+    "planck": (simulatePlanck, physics.PLANCK * 1e34),
+}
+
+
+# Runs a whole class of students through a practical, a chunk of students at a time so memory use stays the same for
+# any size of class and the arrays are small enough to stay in the CPU cache. Returns the value each student calculated
+def virtualClass(practical, students, rng, noise, chunkSize=10000):
+    simulate = PRACTICALS[practical][0]
+    results = np.empty(students)
+    for start in range(0, students, chunkSize):
+        stop = min(start + chunkSize, students)
+        results[start:stop] = simulate(rng, stop - start, noise)
+    return results
+
+
+# Spread of the results, low and high are the 2.5th and 97.5th percentiles so 95% of the class lies between them
+def summarise(results, accepted):
+    percentiles = np.percentile(results, [2.5, 50, 97.5])
+    return {
+        "students": len(results),
+        "mean": results.mean(),
+        "std": results.std(ddof=1) if len(results) > 1 else 0.0,
+        "low": percentiles[0],
+        "median": percentiles[1],
+        "high": percentiles[2],
+        "within5": (physics.percentageError(accepted, results) <= 5).mean() * 100,
+    }
+
+
+# Saves the results as a .npz file, or as a .csv file with one value on each line
+def saveResults(path, columns):
+    if path.endswith(".csv"):
+        names = list(columns.keys())
+        np.savetxt(path, np.column_stack([columns[name] for name in names]), delimiter=",",
+                   header=",".join(names), comments="")
+    else:
+        np.savez_compressed(path, **columns)
+
+
+# Sweeps run every combination of the given settings, each setting being repeated by a number of students
+# The columns saved for each practical, after the settings themselves
+SWEEP_COLUMNS = {
+    "vertical": ["height", "speed", "dropTime", "animationMs", "timeMean", "timeStd", "gMean", "gStd"],
+    "ramp": ["length", "angle", "speed", "dropTime", "animationMs", "timeMean", "timeStd", "gMean", "gStd"],
+    "planck": ["wavelength", "threshold", "appThreshold", "voltageMean", "voltageStd", "hMean", "hStd"],
+}
+
+
+def sweepPoints(args):
+    if args.practical == "vertical":
+        return list(itertools.product(args.heights, args.speeds))
+    if args.practical == "ramp":
+        return list(itertools.product(args.lengths, args.angles, args.speeds))
+    return [(wavelength,) for wavelength in args.wavelengths]
+
+
+# Each student times a single drop from the setting and works out g from s = 0.5at²
+# Students who stopped the stopwatch on 0.00s can't work out g, so they are left out of its average
+def sweepDrop(rng, distance, model, speed, students, noise):
+    dropTime = float(model.dropTime(distance))
+    times = stopwatchReadings(rng, dropTime, students, noise)
+    measured = rulerReadings(rng, distance, students, noise)
+    timed = times > 0
+    g = model.gFromGradient(measured[timed] / times[timed] ** 2)
+    gMean, gStd = (g.mean(), g.std()) if len(g) else (np.nan, np.nan)
+    return [dropTime, dropTime * 1000 * physics.animationSpeed(speed), times.mean(), times.std(), gMean, gStd]
+
+
+def sweepPoint(rng, practical, point, students, noise):
+    if practical == "vertical":
+        height, speed = point
+        return sweepDrop(rng, height, physics.VerticalFallModel(), speed, students, noise)
+    if practical == "ramp":
+        length, angle, speed = point
+        # Angles the ball wouldn't roll down at are flagged by leaving their results as NaN
+        try:
+            model = physics.RampFallModel(np.radians(angle))
+        except ValueError:
+            return [np.nan] * (len(SWEEP_COLUMNS[practical]) - len(point))
+        return sweepDrop(rng, length, model, speed, students, noise)
+
+    wavelength, = point
+    threshold = physics.LedThresholdModel.thresholdVoltage(wavelength)
+    voltages = readNearest(threshold + rng.normal(0, noise.ledJudgement, students), VOLTMETER_RESOLUTION)
+    h = voltages * physics.ELECTRON_CHARGE * wavelength * 1e-9 / physics.SPEED_OF_LIGHT * 1e34
+    return [threshold, physics.LedThresholdModel(wavelength).threshold, voltages.mean(), voltages.std(), h.mean(), h.std()]
+
+
+# Work unit run by each process: a chunk of the points in the sweep, with its own random numbers so the results are
+# the same however many processes are used. Returns a row for each point
+def runShard(practical, points, students, noise, seed):
+    rng = np.random.default_rng(seed)
+    return [list(point) + sweepPoint(rng, practical, point, students, noise) for point in points]
+
+
+# Splits the sweep into chunks, runs them across a pool of processes and merges the rows back into columns in order
+def sweep(practical, points, students, noise, seed=None, workers=None, chunkSize=16, progress=None):
+    chunks = [points[start:start + chunkSize] for start in range(0, len(points), chunkSize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    rows = [None] * len(chunks)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(runShard, practical, chunk, students, noise, chunkSeed): index
+                   for index, (chunk, chunkSeed) in enumerate(zip(chunks, seeds))}
+        for done, future in enumerate(as_completed(futures), 1):
+            rows[futures[future]] = future.result()
+            if progress:
+                progress(done, len(chunks))
+
+    table = np.array([row for chunk in rows for row in chunk], dtype=float).reshape(-1, len(SWEEP_COLUMNS[practical]))
+    return {name: table[:, column] for column, name in enumerate(SWEEP_COLUMNS[practical])}
+
+
+# Reads a list of values, where "start:stop:step" can be used for an evenly spaced range including stop
+def sweepValues(text):
+    values = []
+    for part in text.split(","):
+        if ":" in part:
+            start, stop, step = (float(value) for value in part.split(":"))
+            values.extend(np.round(np.arange(start, stop + step / 2, step), 10))
+        else:
+            values.append(float(part))
+    return values
+
+
+# Whole number greater than 0, used for counts such as the number of students, so 0 is refused with a usage message
+def positiveInt(text):
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError("must be greater than 0, not {}".format(value))
+    return value
+
+
+def printProgress(done, total):
+    sys.stderr.write("\r{} of {} chunks done".format(done, total))
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def runSweep(args):
+    noise = MeasurementNoise(args.reaction_spread, args.parallax, args.led_judgement)
+    points = sweepPoints(args)
+    began = time.perf_counter()
+    columns = sweep(args.practical, points, args.students, noise, args.seed, args.workers, args.chunk_size,
+                    None if args.quiet else printProgress)
+    taken = time.perf_counter() - began
+
+    print("{} {} settings with {} students each in {:.2f}s using {} processes".format(
+        len(points), args.practical, args.students, taken, args.workers or os.cpu_count()))
+    if args.practical == "ramp":
+        stopped = int(np.isnan(columns["dropTime"]).sum())
+        if stopped:
+            print("{} settings left as NaN, the ball doesn't roll down the ramp at those angles".format(stopped))
+    if args.output:
+        saveResults(args.output, columns)
+        print("Results saved to " + args.output)
+    else:
+        names = list(columns.keys())
+        print(",".join(names))
+        for row in zip(*(columns[name] for name in names)):
+            print(",".join("{:.6g}".format(value) for value in row))
+    return 0
+
+
+def runVirtualClass(args):
+    noise = MeasurementNoise(args.reaction_spread, args.parallax, args.led_judgement)
+    rng = np.random.default_rng(args.seed)
+    columns = {}
+
+    print("{:<10}{:>10}{:>10}{:>9}{:>9}{:>9}{:>9}{:>11}{:>9}".format(
+        "practical", "students", "mean", "std", "p2.5", "median", "p97.5", "within 5%", "time"))
+    for practical in args.practicals:
+        began = time.perf_counter()
+        results = virtualClass(practical, args.students, rng, noise, args.chunk_size)
+        taken = time.perf_counter() - began
+        columns[practical] = results
+
+        summary = summarise(results, PRACTICALS[practical][1])
+        print("{:<10}{students:>10}{mean:>10.3f}{std:>9.3f}{low:>9.3f}{median:>9.3f}{high:>9.3f}"
+              "{within5:>10.1f}%{:>8.2f}s".format(practical, taken, **summary))
+
+    if args.output:
+        saveResults(args.output, columns)
+        print("Results saved to " + args.output)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch runs of the Virtual Lab practicals without the GUI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    virtual = subparsers.add_parser("virtualclass", help="simulate a class of students each taking a full set of "
+                                                         "readings, and show the spread of their results")
+    virtual.add_argument("--students", type=positiveInt, default=1000000, help="number of students in the class")
+    virtual.add_argument("--practicals", nargs="+", choices=list(PRACTICALS), default=list(PRACTICALS),
+                         help="practicals to run (g in m/s² for the drops, h in x 10^-34 Js for Planck)")
+    virtual.add_argument("--seed", type=int, default=None, help="seed for the random numbers, to repeat a run")
+    virtual.add_argument("--reaction-spread", type=float, default=0.04,
+                         help="standard deviation of the reaction time in s")
+    virtual.add_argument("--parallax", type=float, default=0.002,
+                         help="standard deviation of the parallax error on the ruler in m")
+    virtual.add_argument("--led-judgement", type=float, default=0.02,
+                         help="standard deviation of the voltage at which the LED is seen to light in V")
+    virtual.add_argument("--chunk-size", type=positiveInt, default=10000, help="students simulated at once")
+    virtual.add_argument("--output", help="save every student's result to a .npz or .csv file")
+    virtual.set_defaults(run=runVirtualClass)
+
+    sweepParser = subparsers.add_parser("sweep", help="run every combination of heights, ramp angles, LED "
+                                                      "wavelengths and speed settings across all cores")
+    sweepParser.add_argument("practical", choices=list(SWEEP_COLUMNS))
+    sweepParser.add_argument("--heights", type=sweepValues, default=sweepValues("0.1:2:0.1"),
+                             help="drop heights in m, as a list (0.5,1) or a range (start:stop:step)")
+    sweepParser.add_argument("--lengths", type=sweepValues, default=sweepValues("0.1:1:0.1"),
+                             help="lengths down the ramp in m")
+    sweepParser.add_argument("--angles", type=sweepValues, default=sweepValues("10:60:5"),
+                             help="ramp angles in degrees")
+    sweepParser.add_argument("--wavelengths", type=sweepValues, default=sweepValues("380:700:10"),
+                             help="LED wavelengths in nm")
+    sweepParser.add_argument("--speeds", type=sweepValues, default=sweepValues("1:10:1"),
+                             help="animation speed slider values (10 is real time)")
+    sweepParser.add_argument("--students", type=positiveInt, default=10000, help="students repeating each setting")
+    sweepParser.add_argument("--seed", type=int, default=None, help="seed for the random numbers, to repeat a run")
+    sweepParser.add_argument("--workers", type=positiveInt, default=None, help="number of processes (default: all cores)")
+    sweepParser.add_argument("--chunk-size", type=positiveInt, default=16, help="settings in each unit of work")
+    sweepParser.add_argument("--reaction-spread", type=float, default=0.04,
+                             help="standard deviation of the reaction time in s")
+    sweepParser.add_argument("--parallax", type=float, default=0.002,
+                             help="standard deviation of the parallax error on the ruler in m")
+    sweepParser.add_argument("--led-judgement", type=float, default=0.02,
+                             help="standard deviation of the voltage at which the LED is seen to light in V")
+    sweepParser.add_argument("--quiet", action="store_true", help="don't show progress")
+    sweepParser.add_argument("--output", help="save the results to a .npz or .csv file, otherwise they are printed")
+    sweepParser.set_defaults(run=runSweep)
+
+    args = parser.parse_args()
+    sys.exit(args.run(args))
+
+
+if __name__ == "__main__":
+    main()
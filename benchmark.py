@@ -0,0 +1,775 @@
+# Offscreen checks and benchmarks for the Virtual Lab scenes
+# Run with: python benchmark.py <check> (see python benchmark.py --help)
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the peak memory of the process isn't reported
+    resource = None
+
+# The scenes are run without a window, so no display is needed
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QT_VERSION_STR, QEvent, QEventLoop, QLineF, QObject, QPointF, QRect, QRectF, Qt, QTimer
+from PyQt5.QtGui import QColor, QFont, QImage, QMouseEvent, QPainter
+from PyQt5.QtWidgets import (QApplication, QGraphicsProxyWidget, QGraphicsRectItem, QGraphicsScene, QGraphicsView,
+                             QLabel, QLineEdit, QPushButton)
+
+import measurements
+import physics
+import VirtualLab
+
+
+# Reads the "seconds:hundredths" text shown on a scene's clock
+def clockReading(scene):
+    seconds, hundredths = scene.clock.text().split(":")
+    return int(seconds) + int(hundredths) / 100
+
+
+# Each case builds a scene ready to drop the ball and returns it with the real time the drop should take
+def verticalExample(button, height, top):
+    scene = VirtualLab.VerticalFall(button, 1)
+    scene.still(1, top, "")
+    scene.drop(top, 2, height, "")
+    return scene, physics.fallTime(height)
+
+
+def rampExample(button, length, x, y):
+    scene = VirtualLab.RampFall(button, 1)
+    scene.still(1, x, y, "")
+    scene.drop(x, y, 2, length, "")
+    return scene, physics.fallTime(length, physics.rampAcceleration())
+
+
+def verticalDIY(button):
+    scene = VirtualLab.VerticalFall(button, 2)
+    scene.DIYAnim()
+    height = scene.model.heightFromScene(scene.ball.pos().y())
+    return scene, physics.fallTime(height)
+
+
+def rampDIY(button):
+    scene = VirtualLab.RampFall(button, 2)
+    scene.DIYAnim()
+    ballPos = scene.ball.pos()
+    length = scene.model.lengthFromScene(ballPos.x(), ballPos.y())
+    return scene, physics.fallTime(length, physics.rampAcceleration())
+
+
+CLOCK_CASES = [
+    ("vertical example 0.5m", lambda button: verticalExample(button, 0.5, 250)),
+    ("vertical example 1m", lambda button: verticalExample(button, 1, 0)),
+    ("ramp example 0.5m", lambda button: rampExample(button, 0.5, 200, 83)),
+    ("ramp example 1m", lambda button: rampExample(button, 1, 395, -30)),
+    ("vertical DIY", verticalDIY),
+    ("ramp DIY", rampDIY),
+]
+
+
+# Runs every drop while the event loop is repeatedly blocked, and checks the time shown on the clock against the real
+# drop time. The time a clock counting one tick per 10ms would have shown is printed alongside for comparison
+def checkClock(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    button = QPushButton()
+    failures = 0
+
+    print("{:<24}{:>7}{:>11}{:>10}{:>12}".format("case", "speed", "expected", "clock", "tick count"))
+    for name, createCase in CLOCK_CASES:
+        for sliderValue in args.speeds:
+            scene, expected = createCase(button)
+            scene.changeSpeed(sliderValue)
+
+            ticks = [0]
+            tickTimer = QTimer()
+            tickTimer.timeout.connect(lambda: ticks.__setitem__(0, ticks[0] + 1))
+
+            # Blocks the event loop for a while every so often, like a busy machine would
+            stallTimer = QTimer()
+            stallTimer.timeout.connect(lambda: time.sleep(args.stall / 1000))
+
+            loop = QEventLoop()
+            scene.finished.connect(loop.quit)
+            scene.startAnims()
+            tickTimer.start(10 * scene.speed)
+            stallTimer.start(args.stall_every)
+            QTimer.singleShot(int(expected * 1000 * scene.speed) + 5000, loop.quit)
+            loop.exec_()
+            stallTimer.stop()
+            tickTimer.stop()
+
+            reading = clockReading(scene)
+            tickReading = ticks[0] / 100
+            ok = abs(reading - expected) <= args.tolerance
+            failures += not ok
+            print("{:<24}{:>7}{:>10.3f}s{:>9.2f}s{:>11.2f}s  {}".format(name, scene.speed, expected, reading,
+                                                                      tickReading, "ok" if ok else "FAIL"))
+            scene.stopAnims()
+
+    print("{} of {} drops outside {}s".format(failures, len(CLOCK_CASES) * len(args.speeds), args.tolerance))
+    return 1 if failures else 0
+
+
+# Steps forwards and backwards through each example animation, and runs each drop, checking that the counts reported
+# by the scene's debugCounts are the same after every round as after the first
+def checkSteps(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    failures = 0
+
+    print("{:<10}{:>8}{:>10}{:>13}{:>14}".format("practical", "items", "proxies", "animations", "connections"))
+    for pagType in ["Vertical", "Ramp", "Planck"]:
+        window = VirtualLab.AnimationWindow(pagType, 1)
+        window.startAnimation(pagType, 1)
+        counts = []
+        for _ in range(args.rounds):
+            for _ in range(3):
+                window.nextStep(pagType)
+                if window.animView.getAnimState() in (2, 4) and pagType != "Planck":
+                    window.animView.startAnims()
+                    window.animView.animFinished()
+            for _ in range(3):
+                window.prevStep(pagType)
+            app.processEvents()
+            counts.append(window.animView.debugCounts())
+
+        ok = all(roundCounts == counts[0] for roundCounts in counts)
+        failures += not ok
+        print("{:<10}{:>8}{:>10}{:>13}{:>14}  {}".format(pagType, counts[-1]["items"], counts[-1]["proxies"],
+                                                        counts[-1]["animations"], counts[-1]["connections"],
+                                                        "ok" if ok else "FAIL"))
+        window.animView.stopAnims()
+        window.deleteLater()
+
+    return 1 if failures else 0
+
+
+# Sends a mouse event to the view at the given point in the scene, as if the user had used the mouse there
+def sendMouse(view, eventType, point):
+    button = Qt.LeftButton if eventType != QEvent.MouseMove else Qt.NoButton
+    buttons = Qt.LeftButton if eventType != QEvent.MouseButtonRelease else Qt.NoButton
+    event = QMouseEvent(eventType, QPointF(view.mapFromScene(point)), button, buttons, Qt.NoModifier)
+    QApplication.sendEvent(view.viewport(), event)
+
+
+# Value below which the given percentage of the sorted values lie
+def percentile(values, percent):
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+# Adds a grid of extra nodes around the DIY Planck circuit, to see how finding components copes with big circuits
+def addNodes(scene, count):
+    columns = max(int(count ** 0.5), 1)
+    for index in range(count):
+        node = QGraphicsRectItem(0, 0, 10, 10)
+        node.setPos(-400 + (index % columns) * 900 / columns, -400 + (index // columns) * 700 / columns)
+        scene.addItem(node)
+        scene.addComponent("extra" + str(index), node, [QPointF(5, 5)])
+
+
+# Draws wires across the DIY Planck circuit by sending the same mouse events a user would, timing each move
+# The scene should only gain one item for each wire drawn, and moving the mouse shouldn't add or remove any items
+def checkWiring(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    scene = VirtualLab.PlanckAnim(QPushButton(), 2)
+    scene.DIYAnim()
+    addNodes(scene, args.components)
+    view = QGraphicsView(scene)
+    view.resize(1000, 800)
+    view.show()
+    rect = scene.itemsBoundingRect()
+    randomPoints = random.Random(args.seed)
+
+    startItems = len(scene.items())
+    mostItems = startItems
+    churnedMoves = 0
+    moveTimes = []
+    releaseTimes = []
+    for wire in range(args.wires):
+        begin = QPointF(randomPoints.uniform(rect.left(), rect.right()), randomPoints.uniform(rect.top(), rect.bottom()))
+        end = QPointF(randomPoints.uniform(rect.left(), rect.right()), randomPoints.uniform(rect.top(), rect.bottom()))
+        sendMouse(view, QEvent.MouseButtonPress, begin)
+        for move in range(1, args.moves + 1):
+            point = begin + (end - begin) * (move / args.moves)
+            itemsBefore = set(scene.items())
+            began = time.perf_counter()
+            sendMouse(view, QEvent.MouseMove, point)
+            moveTimes.append((time.perf_counter() - began) * 1000)
+            itemsAfter = set(scene.items())
+            churnedMoves += itemsAfter != itemsBefore
+            mostItems = max(mostItems, len(itemsAfter))
+        began = time.perf_counter()
+        sendMouse(view, QEvent.MouseButtonRelease, end)
+        releaseTimes.append((time.perf_counter() - began) * 1000)
+        app.processEvents()
+
+    moveTimes.sort()
+    releaseTimes.sort()
+    endItems = len(scene.items())
+    allowedItems = startItems + args.wires
+    slowMove = percentile(moveTimes, 99)
+    print("{} components, {} wires, {} mouse moves each".format(len(scene.components), args.wires, args.moves))
+    print("scene items: {} before, {} after, {} at most (allowed {})".format(startItems, endItems, mostItems,
+                                                                            allowedItems))
+    print("mouse moves which added or removed scene items: {}".format(churnedMoves))
+    print("mouse move: {:.3f}ms median, {:.3f}ms 99th percentile, {:.3f}ms slowest".format(
+        percentile(moveTimes, 50), slowMove, moveTimes[-1]))
+    print("mouse release (finding the components at each end): {:.3f}ms median, {:.3f}ms 99th percentile".format(
+        percentile(releaseTimes, 50), percentile(releaseTimes, 99)))
+
+    ok = mostItems <= allowedItems and endItems == allowedItems and not churnedMoves and slowMove <= args.max_move
+    print("ok" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+# Wires between terminals of the DIY Planck circuit, as a student would draw them
+PLANCK_WIRES = [
+    ("supply.0", "node1.0"), ("node1.0", "resistor.0"), ("resistor.1", "node3.0"), ("node3.0", "bulb.0"),
+    ("bulb.1", "node4.0"), ("node4.0", "node2.0"), ("node2.0", "supply.1"), ("node3.0", "node5.0"),
+    ("node5.0", "voltmeter.0"), ("voltmeter.1", "node6.0"), ("node6.0", "node4.0"),
+]
+
+
+# Wires the DIY Planck circuit, then drags the slider from one end to the other and back for each LED, timing how long
+# the scene takes to solve the circuit and update the voltmeter and LED for each valueChanged
+def checkCircuit(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    scene = VirtualLab.PlanckAnim(QPushButton(), 2)
+    scene.DIYAnim()
+    for start, end in PLANCK_WIRES:
+        scene.addWire(QLineF(), start, end)
+    if not scene.circuitComplete():
+        print("FAIL: the circuit wired by the check isn't complete")
+        return 1
+
+    print("{:>5}{:>11}{:>11}{:>13}{:>13}".format("LED", "lights at", "slider 0", "median", "99th pct"))
+    slowest = 0
+    for led in sorted(physics.LedThresholdModel.LEDS, reverse=True):
+        scene.changeLED(led)
+        solveTimes = []
+        lightsAt = None
+        for drag in range(args.drags):
+            for sliderValue in list(range(500, -1, -1)) + list(range(0, 501)):
+                began = time.perf_counter()
+                scene.slider.setValue(sliderValue)
+                solveTimes.append((time.perf_counter() - began) * 1000)
+                if lightsAt is None and scene.bulb.brush().color() != QColor(255, 255, 255):
+                    lightsAt = scene.voltage.text()
+                if sliderValue == 0:
+                    fullVoltage = scene.voltage.text()
+        solveTimes.sort()
+        slowest = max(slowest, percentile(solveTimes, 99))
+        print("{:>5}{:>10}V{:>10}V{:>11.3f}ms{:>11.3f}ms".format(led, lightsAt, fullVoltage,
+                                                                 percentile(solveTimes, 50),
+                                                                 percentile(solveTimes, 99)))
+
+    ok = slowest <= args.max_solve
+    print("ok" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+# Merge sort the DIY window used to sort its table before the table was kept in a MeasurementTable
+def mergeSort(array):
+    if len(array) > 1:
+        mid = len(array) // 2
+        L = array[:mid]
+        R = array[mid:]
+
+        mergeSort(L)
+
+        mergeSort(R)
+
+        i = 0
+        j = 0
+        k = 0
+
+        while i < len(L) and j < len(R):
+            if L[i] < R[j]:
+                array[k] = L[i]
+                i = i + 1
+            else:
+                array[k] = R[j]
+                j = j + 1
+            k = k + 1
+
+        while i < len(L):
+            array[k] = L[i]
+            i = i + 1
+            k = k + 1
+
+        while j < len(R):
+            array[k] = R[j]
+            k = k + 1
+            j = j + 1
+
+
+# The old way of sorting the table, rows were put in a dict keyed by their height and the heights merge sorted, so
+# rows with the same height were lost
+def dictMergeSort(rows):
+    data = {row[0]: row[1:] for row in rows}
+    heights = list(data.keys())
+    mergeSort(heights)
+    return [[height] + data[height] for height in heights]
+
+
+# Sorts tables of random heights with the old merge sort and with MeasurementTable.sort, checking that the new sort
+# keeps every row and puts them in order of height then average
+def checkSort(args):
+    random.seed(args.seed)
+    print("{:>8}{:>13}{:>11}{:>15}{:>13}{:>11}".format("rows", "old sort", "rows kept", "merge sort all", "argsort",
+                                                        "rows kept"))
+    ok = True
+    for size in args.sizes:
+        # Heights to the nearest cm, so big tables have many repeated heights
+        rows = [[round(random.uniform(0.1, 2), 2)] + [round(random.uniform(0.01, 0.5), 3) for _ in range(3)]
+                for _ in range(size)]
+
+        oldTimes = []
+        for _ in range(args.repeats):
+            began = time.perf_counter()
+            oldRows = dictMergeSort(rows)
+            oldTimes.append((time.perf_counter() - began) * 1000)
+
+        # Merge sorting every row instead, which is what keeping the repeated heights would have cost
+        mergeTimes = []
+        for _ in range(args.repeats):
+            allRows = list(rows)
+            began = time.perf_counter()
+            mergeSort(allRows)
+            mergeTimes.append((time.perf_counter() - began) * 1000)
+
+        table = measurements.MeasurementTable()
+        for row in rows:
+            index = table.addRow(row[0])
+            for reading in row[1:]:
+                table.addReading(index, reading)
+        table.calculateAverages()
+        values = table.values[:table.rows].copy()
+        readings = table.readings[:table.rows].copy()
+        averages = table.averages[:table.rows].copy()
+        newTimes = []
+        for _ in range(args.repeats):
+            table.values[:table.rows] = values
+            table.readings[:table.rows] = readings
+            table.averages[:table.rows] = averages
+            began = time.perf_counter()
+            table.sort()
+            newTimes.append((time.perf_counter() - began) * 1000)
+
+        keys = list(zip(table.values[:table.rows], table.averages[:table.rows]))
+        if table.rows != size or keys != sorted(keys):
+            ok = False
+        print("{:>8}{:>11.3f}ms{:>11}{:>13.3f}ms{:>11.3f}ms{:>11}".format(size, min(oldTimes), len(oldRows),
+                                                                          min(mergeTimes), min(newTimes), table.rows))
+
+    print("ok" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+# Widgets the scenes used for their clock and labels before they were drawn as SceneText items, embedded in the scene
+# with a proxy widget as they were
+def widgetClock(scene):
+    label = QLabel()
+    label.setFont(QFont("Arial", 15))
+    label.setAlignment(Qt.AlignCenter)
+    label.setText("00:00")
+    label.setGeometry(-200, 175, 80, 50)
+    scene.addWidget(label)
+    return label
+
+
+def widgetLabel(scene):
+    label = QLineEdit()
+    label.setReadOnly(True)
+    label.setAlignment(Qt.AlignCenter)
+    label.setFont(QFont("Arial", 10))
+    label.setGeometry(QRect(-200, 245, 150, 50))
+    scene.addWidget(label)
+    return label
+
+
+def sceneClock(scene):
+    clock = VirtualLab.SceneText("00:00")
+    clock.setGeometry(-200, 175, 80, 50)
+    scene.addItem(clock)
+    return clock
+
+
+def sceneLabel(scene):
+    label = VirtualLab.SceneText("", 10, boxed=True)
+    label.setGeometry(QRect(-200, 245, 150, 50))
+    scene.addItem(label)
+    return label
+
+
+LABEL_CASES = [
+    ("clock", widgetClock, sceneClock, lambda update: "{}:{:02}".format(update // 100, update % 100)),
+    ("label", widgetLabel, sceneLabel, lambda update: "Distance = {}m".format(update % 100 / 100)),
+]
+
+
+# Counts the paint events of a view's viewport, so a check can wait until the view has been painted again
+class PaintCounter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            self.paints += 1
+        return False
+
+
+# Changes the text of a label in a scene shown in a view and times until the view has been painted again, for the
+# widgets the scenes used to embed and for the SceneText items which replaced them, then times painting the whole view
+# The text items should show the text they were given without adding a proxy widget to the scene
+def checkLabels(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    print("{:<7}{:>9}{:>12}{:>12}{:>12}{:>15}{:>10}".format("label", "type", "median", "99th pct", "mean",
+                                                              "full repaint", "proxies"))
+    ok = True
+    for name, makeWidget, makeItem, text in LABEL_CASES:
+        for labelType, makeLabel in (("widget", makeWidget), ("item", makeItem)):
+            scene = QGraphicsScene()
+            view = QGraphicsView(scene)
+            view.resize(400, 300)
+            label = makeLabel(scene)
+            view.show()
+            app.processEvents()
+            counter = PaintCounter()
+            view.viewport().installEventFilter(counter)
+
+            updateTimes = []
+            for update in range(args.updates):
+                paints = counter.paints
+                began = time.perf_counter()
+                label.setText(text(update))
+                # The widgets take one more pass of the event loop than the items before the view is painted
+                for _ in range(10):
+                    app.processEvents()
+                    if counter.paints > paints:
+                        break
+                updateTimes.append((time.perf_counter() - began) * 1000)
+
+            repaintTimes = []
+            for _ in range(args.repaints):
+                began = time.perf_counter()
+                view.viewport().repaint()
+                repaintTimes.append((time.perf_counter() - began) * 1000)
+            proxies = sum(isinstance(item, QGraphicsProxyWidget) for item in scene.items())
+
+            mean = sum(updateTimes) / len(updateTimes)
+            updateTimes.sort()
+            repaintTimes.sort()
+            print("{:<7}{:>9}{:>10.3f}ms{:>10.3f}ms{:>10.3f}ms{:>13.3f}ms{:>10}".format(
+                name, labelType, percentile(updateTimes, 50), percentile(updateTimes, 99), mean,
+                percentile(repaintTimes, 50), proxies))
+            if labelType == "item":
+                ok = ok and proxies == 0 and label.text() == text(args.updates - 1)
+            view.deleteLater()
+
+    print("ok" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+# Times the frames of a scene as a practical is gone through, without a view or an event loop
+# A change is a call which moves the scene to another step of the practical. A frame is one pass of the scene's frame
+# clock, or one move of the DIY Planck slider, followed by rendering the whole scene into an image
+class FrameRecorder:
+    def __init__(self, scene):
+        self.scene = scene
+        self.image = None
+        self.changeTimes = []
+        self.advanceTimes = []
+        self.paintTimes = []
+
+    def change(self, method, *args):
+        began = time.perf_counter()
+        method(*args)
+        self.changeTimes.append((time.perf_counter() - began) * 1000)
+
+    def frame(self, advance=None):
+        began = time.perf_counter()
+        if advance is not None:
+            advance()
+        advanced = time.perf_counter()
+        self.paint()
+        self.advanceTimes.append((advanced - began) * 1000)
+        self.paintTimes.append((time.perf_counter() - advanced) * 1000)
+
+    # The image is only made again if the scene rect changes size
+    def paint(self):
+        rect = self.scene.sceneRect()
+        size = rect.size().toSize()
+        if self.image is None or self.image.size() != size:
+            self.image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        self.image.fill(Qt.white)
+        painter = QPainter(self.image)
+        self.scene.render(painter, QRectF(self.image.rect()), rect)
+        painter.end()
+
+    def stills(self, frames):
+        for _ in range(frames):
+            self.frame()
+
+    # Plays the animations started by the scene's startAnims a frame at a time, with the stopwatch set to the time of
+    # each frame instead of running, so every run draws the same frames
+    def play(self):
+        self.change(self.scene.startAnims)
+        self.scene.timer.stop()
+        self.scene.stopwatch.stop()
+        runTime = 0
+        while self.scene.playing:
+            runTime += VirtualLab.FRAME_INTERVAL
+            self.scene.stopwatch.stored = runTime
+            self.frame(self.scene.advanceFrame)
+
+
+# Each case makes a scene and drives it through the steps of its practical as the windows do, once for each round
+def verticalScene(button):
+    return VirtualLab.VerticalFall(button, 1)
+
+
+def verticalFrames(recorder, args):
+    scene = recorder.scene
+    for _ in range(args.rounds):
+        for state, top, height, text in ((1, 250, 0.5, "Distance = 0.5m"), (3, 0, 1, "Distance = 1m")):
+            recorder.change(scene.still, state, top, text)
+            recorder.stills(args.still_frames)
+            recorder.change(scene.drop, top, state + 1, height, text)
+            recorder.play()
+
+
+def rampScene(button):
+    return VirtualLab.RampFall(button, 1)
+
+
+def rampFrames(recorder, args):
+    scene = recorder.scene
+    for _ in range(args.rounds):
+        for state, x, y, length, text in ((1, 200, 83, 0.5, "Ramp Length = 0.5m, θ = 30°"),
+                                          (3, 395, -30, 1, "Ramp Length = 1m, θ = 30°")):
+            recorder.change(scene.still, state, x, y, text)
+            recorder.stills(args.still_frames)
+            recorder.change(scene.drop, x, y, state + 1, length, text)
+            recorder.play()
+
+
+def diyScene(sceneClass):
+    def makeScene(button):
+        scene = sceneClass(button, 2)
+        scene.DIYAnim()
+        return scene
+    return makeScene
+
+
+# The ball is put back where DIYAnim left it before each drop
+def diyFrames(recorder, args):
+    scene = recorder.scene
+    start = scene.ball.pos()
+    for _ in range(args.rounds):
+        recorder.change(scene.ball.move, start)
+        recorder.stills(args.still_frames)
+        recorder.play()
+
+
+def planckScene(button):
+    return VirtualLab.PlanckAnim(button, 1)
+
+
+def planckFrames(recorder, args):
+    scene = recorder.scene
+    for _ in range(args.rounds):
+        for state, led in ((1, 700), (3, 450)):
+            recorder.change(scene.still, state, led)
+            recorder.stills(args.still_frames)
+            recorder.change(scene.slide, state + 1)
+            recorder.play()
+
+
+def planckDIYScene(button):
+    scene = diyScene(VirtualLab.PlanckAnim)(button)
+    for start, end in PLANCK_WIRES:
+        scene.addWire(QLineF(), start, end)
+    return scene
+
+
+# Each round uses the next LED and sweeps the slider from one end to the other and back
+def planckDIYFrames(recorder, args):
+    scene = recorder.scene
+    leds = sorted(physics.LedThresholdModel.LEDS, reverse=True)
+    for sweep in range(args.rounds):
+        recorder.change(scene.changeLED, leds[sweep % len(leds)])
+        for sliderValue in list(range(500, -1, -args.slider_step)) + list(range(0, 501, args.slider_step)):
+            recorder.frame(lambda: scene.slider.setValue(sliderValue))
+
+
+SCENE_CASES = [
+    ("vertical", verticalScene, verticalFrames),
+    ("ramp", rampScene, rampFrames),
+    ("vertical DIY", diyScene(VirtualLab.VerticalFall), diyFrames),
+    ("ramp DIY", diyScene(VirtualLab.RampFall), diyFrames),
+    ("planck", planckScene, planckFrames),
+    ("planck DIY", planckDIYScene, planckDIYFrames),
+]
+
+
+# Peak resident memory of the process in MB, or None where it can't be found
+def peakMemory():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Given in bytes on macOS and in KB everywhere else
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+# Goes through every practical a frame at a time, timing the changes between steps, moving the scene on for each frame
+# and rendering it. Each case is then gone through again with tracemalloc running, for the most memory Python
+# allocated while the practical was gone through and how much of it was still held at the end
+# The results can be saved as JSON and compared with an earlier run, a case fails if its median paint time is more than
+# --max-slowdown times the earlier one
+def checkScenes(args):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    button = QPushButton()
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = {case["case"]: case for case in json.load(file)["cases"]}
+
+    print("{:<14}{:>7}{:>11}{:>11}{:>11}{:>11}{:>13}{:>13}{:>13}{:>11}".format(
+        "case", "frames", "paint p50", "p95", "p99", "max", "advance p99", "change max", "alloc peak", "retained"))
+    results = []
+    failures = 0
+    for name, makeScene, driveScene in SCENE_CASES:
+        if args.cases and name not in args.cases:
+            continue
+        scene = makeScene(button)
+        recorder = FrameRecorder(scene)
+        driveScene(recorder, args)
+
+        # The same scene is gone through again, so anything it still allocates has already been made once
+        # The recorder is dropped before the memory still held is measured, so its times aren't counted
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        tracedRecorder = FrameRecorder(scene)
+        driveScene(tracedRecorder, args)
+        del tracedRecorder
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        paintTimes = sorted(recorder.paintTimes)
+        advanceTimes = sorted(recorder.advanceTimes)
+        result = {
+            "case": name,
+            "frames": len(paintTimes),
+            "changes": len(recorder.changeTimes),
+            "paint": {"p50": percentile(paintTimes, 50), "p95": percentile(paintTimes, 95),
+                      "p99": percentile(paintTimes, 99), "max": paintTimes[-1],
+                      "mean": sum(paintTimes) / len(paintTimes)},
+            "advance": {"p50": percentile(advanceTimes, 50), "p99": percentile(advanceTimes, 99),
+                        "max": advanceTimes[-1]},
+            "changeMax": max(recorder.changeTimes),
+            "allocPeakKB": (peak - start) / 1024,
+            "retainedKB": (current - start) / 1024,
+            "peakRssMB": peakMemory(),
+        }
+        results.append(result)
+
+        status = ""
+        if name in baseline:
+            slowdown = result["paint"]["p50"] / baseline[name]["paint"]["p50"]
+            ok = slowdown <= args.max_slowdown
+            failures += not ok
+            status = "{:.2f}x baseline {}".format(slowdown, "ok" if ok else "FAIL")
+        print("{:<14}{:>7}{:>9.3f}ms{:>9.3f}ms{:>9.3f}ms{:>9.3f}ms{:>11.3f}ms{:>11.3f}ms{:>10.1f}KB{:>9.1f}KB  {}".format(
+            name, result["frames"], result["paint"]["p50"], result["paint"]["p95"], result["paint"]["p99"],
+            result["paint"]["max"], result["advance"]["p99"], result["changeMax"], result["allocPeakKB"],
+            result["retainedKB"], status))
+        scene.stopAnims()
+
+    rss = peakMemory()
+    print("peak memory: " + ("{:.1f}MB".format(rss) if rss is not None else "not available"))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"qt": QT_VERSION_STR, "platform": app.platformName(), "rounds": args.rounds,
+                       "peakRssMB": rss, "cases": results}, file, indent=2)
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen checks and benchmarks for the Virtual Lab scenes")
+    subparsers = parser.add_subparsers(dest="check", required=True)
+
+    clock = subparsers.add_parser("clock", help="check the stopwatch against the real drop time while the event "
+                                                "loop is stalled")
+    clock.add_argument("--speeds", type=int, nargs="+", default=[10, 8],
+                       help="animation speed slider values to run each drop at (10 is real time)")
+    clock.add_argument("--stall", type=float, default=40, help="length of each stall in ms")
+    clock.add_argument("--stall-every", type=int, default=50, help="time between stalls in ms")
+    clock.add_argument("--tolerance", type=float, default=0.015,
+                       help="largest allowed difference between the clock and the real drop time in seconds")
+    clock.set_defaults(run=checkClock)
+
+    steps = subparsers.add_parser("steps", help="step through the example animations and check the scenes don't "
+                                                "gain items, widgets, animations or connections")
+    steps.add_argument("--rounds", type=int, default=20, help="times to step forwards and back through each example")
+    steps.set_defaults(run=checkSteps)
+
+    wiring = subparsers.add_parser("wiring", help="draw wires across the DIY Planck circuit and check the number of "
+                                                  "scene items and the time taken by each mouse move")
+    wiring.add_argument("--wires", type=int, default=200, help="number of wires to draw")
+    wiring.add_argument("--moves", type=int, default=50, help="mouse moves while drawing each wire")
+    wiring.add_argument("--max-move", type=float, default=1.0,
+                        help="largest allowed 99th percentile time for a mouse move in ms")
+    wiring.add_argument("--components", type=int, default=0,
+                        help="extra components to add to the circuit, to time finding components in a big circuit")
+    wiring.add_argument("--seed", type=int, default=1, help="seed for the random wire positions")
+    wiring.set_defaults(run=checkWiring)
+
+    circuitCheck = subparsers.add_parser("circuit", help="time solving the DIY Planck circuit each time the variable "
+                                                         "resistor slider moves")
+    circuitCheck.add_argument("--drags", type=int, default=2,
+                              help="times to drag the slider to one end and back for each LED")
+    circuitCheck.add_argument("--max-solve", type=float, default=1.0,
+                              help="largest allowed 99th percentile time for a slider move in ms")
+    circuitCheck.set_defaults(run=checkCircuit)
+
+    sort = subparsers.add_parser("sort", help="time sorting the DIY measurement table against the old merge sort")
+    sort.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                      help="numbers of rows in the tables to sort")
+    sort.add_argument("--repeats", type=int, default=3, help="times to sort each table, the fastest is shown")
+    sort.add_argument("--seed", type=int, default=1, help="seed for the random heights")
+    sort.set_defaults(run=checkSort)
+
+    labels = subparsers.add_parser("labels", help="time changing the text of the scene clock and labels against the "
+                                                  "widgets they replaced")
+    labels.add_argument("--updates", type=int, default=1000, help="times to change the text of each label")
+    labels.add_argument("--repaints", type=int, default=200, help="times to paint the whole view for each label")
+    labels.set_defaults(run=checkLabels)
+
+    scenes = subparsers.add_parser("scenes", help="time moving on and rendering every frame of each practical, with "
+                                                  "the memory used")
+    scenes.add_argument("--rounds", type=int, default=3, help="times to go through the steps of each practical")
+    scenes.add_argument("--still-frames", type=int, default=10,
+                        help="frames rendered at each still step before the animation is played")
+    scenes.add_argument("--slider-step", type=int, default=5,
+                        help="slider positions moved in each frame of a DIY Planck sweep")
+    scenes.add_argument("--cases", nargs="+", choices=[case[0] for case in SCENE_CASES],
+                        help="only run these cases")
+    scenes.add_argument("--json", help="file to save the results to")
+    scenes.add_argument("--baseline", help="results saved by an earlier run to compare the paint times with")
+    scenes.add_argument("--max-slowdown", type=float, default=1.5,
+                        help="largest allowed median paint time as a multiple of the baseline's")
+    scenes.set_defaults(run=checkScenes)
+
+    args = parser.parse_args()
+    sys.exit(args.run(args))
+
+
+if __name__ == "__main__":
+    main()
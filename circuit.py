@@ -0,0 +1,277 @@
+# Circuit wired up by the student in the DIY Planck's constant practical
+# The wires are kept as a netlist of the terminals they join, which is used to check the circuit is wired correctly,
+# and the circuit is solved for the voltmeter reading and the LED current at each position of the variable resistor
+import math
+
+import numpy as np
+
+
+# Name of a terminal of a component, terminals are numbered from 0
+def terminal(component, index):
+    return "{}.{}".format(component, index)
+
+
+# Terminals joined together by wires, kept as a union-find so whether two terminals are connected can be answered
+# straight away however many wires there are
+# Merges are only ever undone in the opposite order to the one they were made in, so each root remembers its own size
+# and no path compression is done. Removing a wire rolls the merges back to just before it and makes the later ones again
+class Netlist:
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+        self.wires = {}
+        self.order = []
+        self.merges = []
+        self.nextWire = 0
+
+    def addTerminal(self, name):
+        if name not in self.parent:
+            self.parent[name] = name
+            self.size[name] = 1
+
+    # Terminal at the root of the net the terminal is in, two terminals are connected if they have the same root
+    def find(self, name):
+        self.addTerminal(name)
+        while self.parent[name] != name:
+            name = self.parent[name]
+        return name
+
+    def connected(self, first, second):
+        return self.find(first) == self.find(second)
+
+    # The smaller net is joined onto the larger, so no net is more than log(n) deep
+    def merge(self, first, second):
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            self.merges.append(None)
+            return
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        self.merges.append((second, first))
+
+    def unmerge(self):
+        merge = self.merges.pop()
+        if merge is not None:
+            child, root = merge
+            self.parent[child] = child
+            self.size[root] -= self.size[child]
+
+    # Adds a wire between two terminals and returns its number, which is used to remove it again
+    def addWire(self, first, second):
+        wire = self.nextWire
+        self.nextWire += 1
+        self.wires[wire] = (first, second)
+        self.order.append(wire)
+        self.merge(first, second)
+        return wire
+
+    # Removes any one wire, only the wires drawn after it have to be merged again
+    def removeWire(self, wire):
+        index = self.order.index(wire)
+        later = self.order[index + 1:]
+        for _ in range(len(later) + 1):
+            self.unmerge()
+        del self.order[index]
+        del self.wires[wire]
+        for laterWire in later:
+            self.merge(*self.wires[laterWire])
+
+    # Removes the last wire drawn, returns its number or None if there are no wires
+    def undo(self):
+        if not self.order:
+            return None
+        wire = self.order[-1]
+        self.removeWire(wire)
+        return wire
+
+    def clear(self):
+        self.__init__()
+
+    # The nets the two terminals of a component are in
+    def nets(self, component):
+        return self.find(terminal(component, 0)), self.find(terminal(component, 1))
+
+    # Whether the LED is in series with the resistor across the supply, with the voltmeter across the LED
+    # Either way round is accepted for each component. Each check only looks at the nets of the four components, so it
+    # takes the same time however many wires there are
+    def isPlanckCircuit(self, supply="supply", resistor="resistor", led="bulb", voltmeter="voltmeter"):
+        supplyNets = self.nets(supply)
+        resistorNets = self.nets(resistor)
+        ledNets = self.nets(led)
+        voltmeterNets = self.nets(voltmeter)
+
+        # Nothing may be shorted out, which would leave both of its terminals on the same net
+        for nets in (supplyNets, resistorNets, ledNets, voltmeterNets):
+            if nets[0] == nets[1]:
+                return False
+
+        # The resistor and the LED share exactly one net, between them
+        shared = set(resistorNets) & set(ledNets)
+        if len(shared) != 1:
+            return False
+        between = shared.pop()
+
+        # Their other ends go to either side of the supply, which mustn't be connected to the net between them
+        ends = {resistorNets[0] if resistorNets[1] == between else resistorNets[1],
+                ledNets[0] if ledNets[1] == between else ledNets[1]}
+        if ends != set(supplyNets):
+            return False
+
+        return set(voltmeterNets) == set(ledNets)
+
+
+# Electrical properties of the parts of the DIY circuit
+# The supply has a small internal resistance, so a short circuit draws a large but finite current
+SUPPLY_VOLTAGE = 5.0
+SUPPLY_RESISTANCE = 1.0
+VOLTMETER_RESISTANCE = 10e6
+# The variable resistor has a logarithmic track, so every part of the slider changes the LED current by the same factor
+RHEOSTAT_MIN = 100.0
+RHEOSTAT_MAX = 10e6
+RHEOSTAT_POSITIONS = 500
+# LEDs are modelled as Shockley diodes which pass LED_ON_CURRENT at their threshold voltage
+THERMAL_VOLTAGE = 0.02585
+LED_IDEALITY = 2.0
+LED_ON_CURRENT = 1e-6
+# Tiny conductance from every net to the supply's negative terminal, so a net that isn't wired to anything still has
+# a voltage
+GMIN = 1e-12
+
+
+def rheostatResistance(sliderValue):
+    return RHEOSTAT_MIN * (RHEOSTAT_MAX / RHEOSTAT_MIN) ** (sliderValue / RHEOSTAT_POSITIONS)
+
+
+def ledSaturationCurrent(threshold):
+    return LED_ON_CURRENT / math.expm1(threshold / (LED_IDEALITY * THERMAL_VOLTAGE))
+
+
+# Limits how far the voltage across a diode can move in one step of Newton's method, as SPICE does, so the exponential
+# doesn't overflow when the solver starts far from the answer
+def limitJunction(new, old, scale, critical):
+    if new > critical and abs(new - old) > 2 * scale:
+        if old > 0:
+            step = 1 + (new - old) / scale
+            return old + scale * math.log(step) if step > 0 else critical
+        return scale * math.log(new / scale)
+    return new
+
+
+# Readings from a solved circuit
+class Reading:
+    def __init__(self, voltmeter, ledVoltage, ledCurrent, iterations):
+        self.voltmeter = voltmeter
+        self.ledVoltage = ledVoltage
+        self.ledCurrent = ledCurrent
+        self.iterations = iterations
+
+
+# Modified nodal analysis of whatever circuit the student has wired, found from the nets of the netlist
+# The supply is replaced by its Norton equivalent, so the only unknowns are the voltages of the nets measured from the
+# supply's negative terminal. The parts which don't change are stamped into the matrix once when the solver is built,
+# and each solve only adds the variable resistor and the LED, starting Newton's method from the last answer
+class CircuitSolver:
+    def __init__(self, netlist, threshold, supply="supply", resistor="resistor", led="bulb", voltmeter="voltmeter"):
+        self.supply = supply
+        self.resistor = resistor
+        self.led = led
+        self.voltmeter = voltmeter
+        self.saturation = ledSaturationCurrent(threshold)
+        self.scale = LED_IDEALITY * THERMAL_VOLTAGE
+        self.critical = self.scale * math.log(self.scale / (math.sqrt(2) * self.saturation))
+
+        for component in (supply, resistor, led, voltmeter):
+            netlist.addTerminal(terminal(component, 0))
+            netlist.addTerminal(terminal(component, 1))
+
+        # Each net is given a row of the matrix, the supply's negative terminal is the reference with no row
+        ground = netlist.find(terminal(supply, 1))
+        roots = sorted({netlist.find(name) for name in netlist.parent} - {ground})
+        rows = {root: row for row, root in enumerate(roots)}
+        rows[ground] = -1
+        self.terminalRows = {component: (rows[netlist.find(terminal(component, 0))],
+                                         rows[netlist.find(terminal(component, 1))])
+                             for component in (supply, resistor, led, voltmeter)}
+
+        size = len(roots)
+        rowIndices, columnIndices, values = [], [], []
+        for row in range(size):
+            rowIndices.append(row)
+            columnIndices.append(row)
+            values.append(GMIN)
+        self.addStamp(rowIndices, columnIndices, values, *self.terminalRows[supply], 1 / SUPPLY_RESISTANCE)
+        self.addStamp(rowIndices, columnIndices, values, *self.terminalRows[voltmeter], 1 / VOLTMETER_RESISTANCE)
+        self.matrix = np.zeros((size, size))
+        np.add.at(self.matrix, (np.array(rowIndices, dtype=int), np.array(columnIndices, dtype=int)), values)
+
+        self.currents = np.zeros(size)
+        self.addCurrent(self.currents, *self.terminalRows[supply], SUPPLY_VOLTAGE / SUPPLY_RESISTANCE)
+        self.voltages = np.zeros(size)
+
+    # Adds a conductance between two rows as lists of matrix entries, a row of -1 is the reference and is left out
+    @staticmethod
+    def addStamp(rowIndices, columnIndices, values, first, second, conductance):
+        for row, column, value in ((first, first, conductance), (second, second, conductance),
+                                   (first, second, -conductance), (second, first, -conductance)):
+            if row >= 0 and column >= 0:
+                rowIndices.append(row)
+                columnIndices.append(column)
+                values.append(value)
+
+    @staticmethod
+    def stamp(matrix, first, second, conductance):
+        if first >= 0:
+            matrix[first, first] += conductance
+        if second >= 0:
+            matrix[second, second] += conductance
+        if first >= 0 and second >= 0:
+            matrix[first, second] -= conductance
+            matrix[second, first] -= conductance
+
+    # Current driven into the first row and out of the second
+    @staticmethod
+    def addCurrent(currents, first, second, current):
+        if first >= 0:
+            currents[first] += current
+        if second >= 0:
+            currents[second] -= current
+
+    def voltage(self, voltages, rows):
+        return (voltages[rows[0]] if rows[0] >= 0 else 0.0) - (voltages[rows[1]] if rows[1] >= 0 else 0.0)
+
+    # Solves the circuit with the variable resistor slider at the given position (0 to 500)
+    def solve(self, sliderValue, tolerance=1e-9, maxIterations=100):
+        resistorMatrix = self.matrix.copy()
+        self.stamp(resistorMatrix, *self.terminalRows[self.resistor], 1 / rheostatResistance(sliderValue))
+        anode, cathode = self.terminalRows[self.led]
+
+        voltages = self.voltages
+        ledVoltage = self.voltage(voltages, (anode, cathode))
+        for iteration in range(1, maxIterations + 1):
+            # The LED is replaced by the straight line touching its curve at the current guess
+            exponential = math.exp(ledVoltage / self.scale)
+            ledCurrent = self.saturation * (exponential - 1)
+            conductance = self.saturation * exponential / self.scale + GMIN
+
+            matrix = resistorMatrix.copy()
+            currents = self.currents.copy()
+            self.stamp(matrix, anode, cathode, conductance)
+            self.addCurrent(currents, cathode, anode, ledCurrent - conductance * ledVoltage)
+            newVoltages = np.linalg.solve(matrix, currents)
+
+            # Finished once neither the voltages nor the point on the LED's curve move any more
+            change = np.abs(newVoltages - voltages).max() if len(voltages) else 0.0
+            voltages = newVoltages
+            newLedVoltage = self.voltage(voltages, (anode, cathode))
+            if change < tolerance and abs(newLedVoltage - ledVoltage) < tolerance:
+                break
+            ledVoltage = limitJunction(newLedVoltage, ledVoltage, self.scale, self.critical)
+
+        self.voltages = voltages
+        ledVoltage = self.voltage(voltages, (anode, cathode))
+        ledCurrent = self.saturation * math.expm1(ledVoltage / self.scale)
+        return Reading(abs(self.voltage(voltages, self.terminalRows[self.voltmeter])), ledVoltage, ledCurrent,
+                       iteration)
@@ -0,0 +1,125 @@
+# Measurements taken by the student in the DIY practicals
+# The results table holds the readings of each row, the running statistics of the readings and the averages, and
+# keeps its rows in order of the variable
+# Each column is a NumPy array with a row for every value of the variable the student changes (height or wavelength),
+# empty cells are NaN
+import numpy as np
+
+
+class MeasurementTable:
+    # Room is made for this many rows to start with, and doubled whenever it runs out
+    START_ROWS = 8
+    # Arrays with a row for each row of the table, which are grown and sorted together
+    COLUMNS = ["values", "readings", "averages", "counts", "means", "squares", "minimums", "maximums"]
+
+    def __init__(self, repeats=3):
+        self.startRepeats = repeats
+        self.clear()
+
+    def clear(self):
+        self.rows = 0
+        # Row of each value of the variable, if a value has been added more than once it is the first of its rows
+        self.rowIndex = {}
+        self.repeats = self.startRepeats
+        self.values = np.full(self.START_ROWS, np.nan)
+        self.readings = np.full((self.START_ROWS, self.repeats), np.nan)
+        self.averages = np.full(self.START_ROWS, np.nan)
+        # Running statistics of the readings on each row, updated as each reading is added
+        self.counts = np.zeros(self.START_ROWS, dtype=int)
+        self.means = np.zeros(self.START_ROWS)
+        self.squares = np.zeros(self.START_ROWS)
+        self.minimums = np.full(self.START_ROWS, np.nan)
+        self.maximums = np.full(self.START_ROWS, np.nan)
+
+    # New rows are filled in the same way as clear, so they look like rows nothing has been added to
+    def grow(self):
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            empty = 0 if name in ("counts", "means", "squares") else np.nan
+            setattr(self, name, np.concatenate([column, np.full(column.shape, empty, dtype=column.dtype)]))
+
+    # Adds another repeat to every row, for when a reading is added to a row which is full
+    def addRepeat(self):
+        self.readings = np.concatenate([self.readings, np.full((len(self.readings), 1), np.nan)], axis=1)
+        self.repeats += 1
+
+    # Adds a row for a new value of the variable, returns the number of the row
+    def addRow(self, value):
+        if self.rows == len(self.values):
+            self.grow()
+        row = self.rows
+        self.values[row] = float(value)
+        self.rowIndex.setdefault(float(value), row)
+        self.rows += 1
+        return row
+
+    # Row for a value of the variable, or None if it hasn't been added
+    def findRow(self, value):
+        return self.rowIndex.get(float(value))
+
+    def isFull(self, row):
+        return self.counts[row] == self.repeats
+
+    # Puts a reading in the next repeat of the row, adding another repeat if the row is full, and updates the running
+    # statistics of the row with Welford's method. Returns the repeat used
+    # Readings fill a row in order, so the count of the row is also the next empty repeat
+    def addReading(self, row, reading):
+        if self.isFull(row):
+            self.addRepeat()
+        repeat = int(self.counts[row])
+        self.readings[row, repeat] = reading
+
+        count = repeat + 1
+        delta = reading - self.means[row]
+        self.means[row] += delta / count
+        self.squares[row] += delta * (reading - self.means[row])
+        self.counts[row] = count
+        self.minimums[row] = reading if count == 1 else min(self.minimums[row], reading)
+        self.maximums[row] = reading if count == 1 else max(self.maximums[row], reading)
+        return repeat
+
+    # Standard deviation of the readings on a row, NaN until the row has two readings
+    def standardDeviation(self, row):
+        count = self.counts[row]
+        if count < 2:
+            return np.nan
+        return float(np.sqrt(self.squares[row] / (count - 1)))
+
+    # Uncertainty in the average of a row, taken as half the range of its readings, NaN until it has two readings
+    def uncertainty(self, row):
+        if self.counts[row] < 2:
+            return np.nan
+        return float((self.maximums[row] - self.minimums[row]) / 2)
+
+    # Average of the readings on every row, taken from the running means, rows with no readings are left empty
+    def calculateAverages(self):
+        counts = self.counts[:self.rows]
+        self.averages[:self.rows] = np.where(counts > 0, np.round(self.means[:self.rows], 3), np.nan)
+
+    # Puts the rows in ascending order of the variable, then of the average for rows with the same value. Rows which
+    # are the same in both, or have no average yet, stay in the order they were entered, and no row is ever dropped
+    # Returns the order the rows were taken from
+    def sort(self):
+        order = self.sortOrder(self.values[:self.rows], self.averages[:self.rows])
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:self.rows] = column[order]
+        self.rowIndex = {}
+        for row, value in enumerate(self.values[:self.rows].tolist()):
+            self.rowIndex.setdefault(value, row)
+        return order
+
+    # np.lexsort sorts by the last key first and is stable, NaN averages go after any number
+    @staticmethod
+    def sortOrder(values, averages):
+        return np.lexsort((averages, values))
+
+    def isEmpty(self):
+        return self.rows == 0
+
+    # Value of the variable and the running average of a row, rounded like the averages column, or None if the row has
+    # no readings yet
+    def point(self, row):
+        if row >= self.rows or self.counts[row] == 0:
+            return None
+        return float(self.values[row]), round(float(self.means[row]), 3)
@@ -0,0 +1,297 @@
+# Physics used by the Virtual Lab practicals
+# Kept apart from the Qt code so the experiments can be run, tested and benchmarked without the GUI
+# The scenes call into the models at the bottom of this module, which batch tools can use in the same way
+# Functions which take a height, length or voltage also accept NumPy arrays, so many readings can be worked out at once
+import math
+
+import numpy as np
+
+G = 9.81
+PLANCK = 6.63e-34
+ELECTRON_CHARGE = 1.6e-19
+SPEED_OF_LIGHT = 3e8
+
+# Number of pixels in the scenes which make up one metre
+PIXELS_PER_METRE = 503
+
+# Angle of the ramp used in the ramp practical
+RAMP_ANGLE = math.pi / 6
+
+# Moment of inertia factors (I = k × m × r²) for a ball which rolls down the ramp instead of sliding
+SOLID_BALL = 2 / 5
+HOLLOW_BALL = 2 / 3
+
+
+# Acceleration of a ball down a ramp, the inertia factor slows a rolling ball as some of the energy goes into spinning it
+# and rolling resistance acts against the motion. A ball which would not start moving has an acceleration of 0
+def rampAcceleration(angle=RAMP_ANGLE, inertia=0.0, rollingResistance=0.0):
+    acceleration = G * (math.sin(angle) - rollingResistance * math.cos(angle)) / (1 + inertia)
+    return max(acceleration, 0.0)
+
+
+# Time in seconds to cover a distance from rest with a constant acceleration, s = 0.5at²
+def fallTime(distance, acceleration=G):
+    if distance <= 0:
+        return 0.0
+    if acceleration <= 0:
+        return math.inf
+    return math.sqrt(2 * distance / acceleration)
+
+
+# Straight line of best fit through the points, returns the gradient and the y intercept
+def fitLine(x, y):
+    gradient, intercept = np.polyfit(np.asarray(x, dtype=float), np.asarray(y, dtype=float), 1)
+    return gradient, intercept
+
+
+# Gradients of the lines of best fit through many sets of points at once, one set of points on each row
+# Gives the same gradient as fitLine for each row without fitting them one by one
+def fitGradients(x, y):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    dx = x - x.mean(axis=-1, keepdims=True)
+    dy = y - y.mean(axis=-1, keepdims=True)
+    return (dx * dy).sum(axis=-1) / (dx * dx).sum(axis=-1)
+
+
+# Line of best fit kept up to date as points are added and removed, from running sums of the points, so moving one
+# point doesn't mean fitting all of them again. Gives the same line as fitLine through the points it holds
+class RunningLine:
+    def __init__(self):
+        self.count = 0
+        self.sumX = 0.0
+        self.sumY = 0.0
+        self.sumXX = 0.0
+        self.sumXY = 0.0
+
+    def add(self, x, y, weight=1):
+        self.count += weight
+        self.sumX += weight * x
+        self.sumY += weight * y
+        self.sumXX += weight * x * x
+        self.sumXY += weight * x * y
+
+    def remove(self, x, y):
+        self.add(x, y, -1)
+
+    # Gradient of the line, NaN until there are two points with different x values
+    def gradient(self):
+        spread = self.count * self.sumXX - self.sumX * self.sumX
+        if self.count < 2 or spread <= 0:
+            return math.nan
+        return (self.count * self.sumXY - self.sumX * self.sumY) / spread
+
+    def intercept(self):
+        gradient = self.gradient()
+        if math.isnan(gradient):
+            return math.nan
+        return (self.sumY - gradient * self.sumX) / self.count
+
+
+def percentageError(accepted, measured):
+    return abs((accepted - measured) / accepted) * 100
+
+
+# Motion of the ball from rest with a constant acceleration, sampled so an animation can look up where the ball is
+# instead of working it out every frame
+# valueForProgress gives the fraction of the distance covered after a fraction of the time, so a trajectory can be
+# used in place of an easing curve
+class Trajectory:
+    def __init__(self, distance, acceleration=G, samples=256):
+        self.distance = distance
+        self.acceleration = acceleration
+        self.duration = fallTime(distance, acceleration)
+
+        self.times = np.linspace(0.0, 1.0, samples)
+        if self.distance > 0 and math.isfinite(self.duration):
+            # s = 0.5at², as a fraction of the whole distance
+            self.progress = 0.5 * acceleration * (self.times * self.duration) ** 2 / distance
+        else:
+            self.progress = np.ones(samples)
+
+    # Duration in ms, as used by the animations
+    def durationMs(self):
+        return self.duration * 1000
+
+    def valueForProgress(self, fraction):
+        return float(np.interp(fraction, self.times, self.progress))
+
+    # Distance travelled in metres after the given number of seconds
+    def position(self, seconds):
+        if not math.isfinite(self.duration):
+            return 0.0
+        if self.duration == 0:
+            return self.distance
+        return float(np.interp(seconds / self.duration, self.times, self.progress)) * self.distance
+
+
+# Number of times slower than real time the animations run for a position of the speed slider (1 to 10)
+def animationSpeed(sliderValue):
+    if sliderValue == 1 or sliderValue == 10:
+        return 11 - sliderValue
+    return 10 - sliderValue
+
+
+def verticalTrajectory(height):
+    return Trajectory(height, G)
+
+
+def rampTrajectory(length, angle=RAMP_ANGLE, inertia=0.0, rollingResistance=0.0):
+    return Trajectory(length, rampAcceleration(angle, inertia, rollingResistance))
+
+
+# Vertical drop practical: a ball dropped from rest through a measured height
+# The line of best fit of height against time² has a gradient of g/2
+class VerticalFallModel:
+    # Height in pixels of the bottom of the ball when it lands in the DIY scene
+    FLOOR = 465
+
+    def __init__(self, g=G):
+        self.g = g
+
+    def acceleration(self):
+        return self.g
+
+    def dropTime(self, height):
+        return np.sqrt(2 * np.clip(height, 0, None) / self.g)
+
+    def trajectory(self, height):
+        return Trajectory(height, self.g)
+
+    # Height of the drop in metres from the position of the ball in the DIY scene
+    def heightFromScene(self, y):
+        return (self.FLOOR - y) / PIXELS_PER_METRE
+
+    @staticmethod
+    def gFromGradient(gradient):
+        return gradient * 2
+
+
+# Ramp practical: a ball released from rest a measured length up a ramp
+# The line of best fit of length against time² has a gradient of g×sin(θ)/2
+# A ramp which the ball wouldn't roll down, because it is flat or the rolling resistance is too high, raises a ValueError
+# when the model is made, so every drop time and trajectory of a model is finite
+class RampFallModel:
+    # Point in the DIY scene which lengths along the ramp are measured from
+    BOTTOM = (-100, 455)
+
+    def __init__(self, angle=RAMP_ANGLE, inertia=0.0, rollingResistance=0.0, g=G):
+        self.angle = angle
+        self.inertia = inertia
+        self.rollingResistance = rollingResistance
+        self.g = g
+        if self.acceleration() <= 0:
+            raise ValueError("the ball would not roll down a ramp at {:.3g} rad with a rolling resistance of {:.3g}"
+                             .format(angle, rollingResistance))
+
+    def acceleration(self):
+        return rampAcceleration(self.angle, self.inertia, self.rollingResistance) * self.g / G
+
+    def dropTime(self, length):
+        return np.sqrt(2 * np.clip(length, 0, None) / self.acceleration())
+
+    def trajectory(self, length):
+        return Trajectory(length, self.acceleration())
+
+    # Length along the ramp in metres from the position of the ball in the DIY scene
+    def lengthFromScene(self, x, y):
+        return math.hypot(x - self.BOTTOM[0], y - self.BOTTOM[1]) / PIXELS_PER_METRE
+
+    def gFromGradient(self, gradient):
+        return gradient * 2 / math.sin(self.angle)
+
+
+# Planck's constant practical: the voltage across an LED when it starts to light is hc/eλ
+# The colour of the LED is looked up from a table with a row for every 0.01V across it, so solving the circuit for a new
+# position of the slider only needs one lookup to colour the LED
+class LedThresholdModel:
+    # Voltage at which each LED starts to light and its colour once fully lit. The LED fades in from white over
+    # LIGHT_RANGE volts above the threshold. Any other wavelength is interpolated between these, so a new LED only needs
+    # a row here
+    LEDS = {
+        700: (1.7, (255, 0, 0)),
+        630: (1.95, (255, 153, 0)),
+        580: (2.1, (255, 255, 0)),
+        520: (2.35, (0, 255, 0)),
+        450: (2.75, (0, 0, 255)),
+        420: (2.9, (153, 0, 255)),
+        380: (3.2, (25, 0, 51)),
+    }
+    LIGHT_RANGE = 0.51
+    # Thresholds used by the example animation, where the LED changes by one step of 1 for each 0.01V
+    EXAMPLE_THRESHOLDS = {700: (1.7, (0, -1, -1)), 450: (2.7, (-1, -1, 0))}
+    SUPPLY_VOLTAGE = 5
+    # Rows of the colour tables, one for each 0.01V from 0V to the supply voltage
+    VOLTAGE_STEPS = SUPPLY_VOLTAGE * 100 + 1
+    WHITE = (255, 255, 255)
+
+    # Tables already built, by wavelength
+    tables = {}
+
+    def __init__(self, led=700):
+        self.changeLED(led)
+
+    def changeLED(self, led):
+        self.led = led
+        self.threshold, self.fullColour = self.ledSettings(led)
+        self.table = self.colourTable(led)
+        self.red, self.green, self.blue = self.WHITE
+
+    # Threshold and fully lit colour of an LED of any wavelength
+    @classmethod
+    def ledSettings(cls, wavelength):
+        wavelengths = sorted(cls.LEDS)
+        threshold = float(np.interp(wavelength, wavelengths, [cls.LEDS[led][0] for led in wavelengths]))
+        colour = tuple(float(np.interp(wavelength, wavelengths, [cls.LEDS[led][1][channel] for led in wavelengths]))
+                       for channel in range(3))
+        return threshold, colour
+
+    # Colour of an LED at each voltage, found from how far through the light range the voltage is
+    # The voltage is counted in 0.01V steps, the first step being at the threshold
+    @classmethod
+    def colourAt(cls, voltage, threshold, fullColour):
+        steps = np.floor((np.asarray(voltage, dtype=float) - threshold) * 100 + 1e-6) + 1
+        fraction = np.clip(steps / round(cls.LIGHT_RANGE * 100), 0, 1)[..., None]
+        white = np.array(cls.WHITE, dtype=float)
+        return np.round(white + (np.array(fullColour) - white) * fraction).astype(np.uint8)
+
+    # Colour of the LED at every 0.01V from 0V to the supply voltage, as a list of (red, green, blue) tuples indexed by
+    # the voltage in hundredths of a volt
+    @classmethod
+    def colourTable(cls, wavelength):
+        if wavelength not in cls.tables:
+            threshold, fullColour = cls.ledSettings(wavelength)
+            voltages = np.arange(cls.VOLTAGE_STEPS) / 100
+            cls.tables[wavelength] = [tuple(row) for row in cls.colourAt(voltages, threshold, fullColour).tolist()]
+        return cls.tables[wavelength]
+
+    # Colour of the LED for any voltage across it, from the row of the table for the 0.01V step the voltage is in
+    # Voltages outside the table are given the colour of its first or last row
+    def voltageColour(self, voltValue):
+        step = min(max(math.floor(voltValue * 100 + 1e-6), 0), self.VOLTAGE_STEPS - 1)
+        self.red, self.green, self.blue = self.table[step]
+        return self.colour()
+
+    def reset(self):
+        self.red, self.green, self.blue = self.WHITE
+
+    def colour(self):
+        return self.red, self.green, self.blue
+
+    # Colour of the LED in the example animation, where the voltage rises steadily
+    def exampleColour(self, voltValue):
+        if self.led not in self.EXAMPLE_THRESHOLDS:
+            return self.colour()
+        threshold, change = self.EXAMPLE_THRESHOLDS[self.led]
+        steps = min(max(int(round(voltValue * 100)) - int(round(threshold * 100)) + 1, 0), 255)
+        self.red, self.green, self.blue = (255 + delta * steps for delta in change)
+        return self.colour()
+
+    @staticmethod
+    def thresholdVoltage(wavelength):
+        return PLANCK * SPEED_OF_LIGHT / (ELECTRON_CHARGE * wavelength * 1e-9)
+
+    # Planck's constant (in × 10^-34) from the gradient of voltage against 1/λ (in × 10^6 m^-1)
+    @staticmethod
+    def planckFromGradient(gradient):
+        return ((gradient * 1.6) / 3) * 10